@@ -5,6 +5,9 @@ import './index.css';
 
 const BACKEND_ROUTE = "api/routes/chat/";
 
+// Identifies this browser tab's conversation so the backend keeps its history separate.
+const SESSION_ID = crypto.randomUUID();
+
 const ChatInterface = () => {
   const [messages, setMessages] = useState([
     {
@@ -33,7 +36,7 @@ const ChatInterface = () => {
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ message: text }),
+        body: JSON.stringify({ message: text, session_id: SESSION_ID }),
       });
 
       if (!response.ok) {
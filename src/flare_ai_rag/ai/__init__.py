@@ -1,14 +1,23 @@
 from .base import AsyncBaseClient, BaseClient
-from .gemini import EmbeddingTaskType, GeminiEmbedding, GeminiProvider
+from .embedding_cache import CachedGeminiEmbedding
+from .gemini import (
+    EmbeddingTaskType,
+    GeminiEmbedding,
+    GeminiProvider,
+    get_gemini_provider,
+)
 from .model import Model
-from .openrouter import OpenRouterClient
+from .openrouter import OpenRouterClient, get_openrouter_client
 
 __all__ = [
     "AsyncBaseClient",
     "BaseClient",
+    "CachedGeminiEmbedding",
     "EmbeddingTaskType",
     "GeminiEmbedding",
     "GeminiProvider",
     "Model",
     "OpenRouterClient",
+    "get_gemini_provider",
+    "get_openrouter_client",
 ]
@@ -1,9 +1,23 @@
+import asyncio
+import contextlib
+import functools
+import random
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any, Literal, Protocol, TypedDict, runtime_checkable
 
 import httpx
-import requests
+
+# Retry policy for rate-limited (429) or failing (5xx) API requests. POSTs such
+# as chat completions are not idempotent, so they are only retried when the
+# server refused the request outright. Retry-After is capped at HTTP_MAX_DELAY.
+HTTP_MAX_RETRIES = 4
+HTTP_BACKOFF_BASE = 0.5
+HTTP_MAX_DELAY = 30.0
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRYABLE_POST_STATUS_CODES = frozenset({429, 503})
 
 
 @dataclass
@@ -78,6 +92,35 @@ class BaseAIProvider(ABC):
             ModelResponse containing the response text and metadata
         """
 
+    @abstractmethod
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """Asynchronous variant of `generate`
+
+        Args:
+            prompt: Input text prompt
+            response_mime_type: Expected response format
+            response_schema: Expected response structure schema
+
+        Returns:
+            ModelResponse containing the generated text and metadata
+        """
+
+    @abstractmethod
+    async def asend_message(self, msg: str) -> ModelResponse:
+        """Asynchronous variant of `send_message`
+
+        Args:
+            msg: Input message text
+
+        Returns:
+            ModelResponse containing the response text and metadata
+        """
+
 
 class CompletionRequest(TypedDict):
     model: str
@@ -94,22 +137,84 @@ class ChatRequest(TypedDict):
     messages: list[Message]
 
 
+@functools.cache
+def shared_http_client() -> httpx.Client:
+    """
+    Return the process-wide pooled HTTP client used by every `BaseClient`.
+
+    Clients for the same host reuse its keep-alive connections instead of
+    paying a new TCP+TLS handshake per instance. HTTP/2 is negotiated where
+    the server supports it, so concurrent requests share one connection.
+    """
+    return httpx.Client(
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+    )
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Return how long to wait before retrying a throttled or failed request."""
+    try:
+        delay = float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        delay = HTTP_BACKOFF_BASE * 2**attempt
+        delay += random.uniform(0, delay / 2)  # noqa: S311
+    return min(max(delay, 0.0), HTTP_MAX_DELAY)
+
+
 class BaseClient:
     """A base class to handle HTTP requests and common logic for API interaction."""
 
-    def __init__(self, base_url: str, api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None = None,
+        client: httpx.Client | None = None,
+    ) -> None:
         """
         :param base_url: The base URL for the API.
         :param api_key: Optional API key for authentication.
+        :param client: Optional HTTP client. Defaults to `shared_http_client()`.
         """
         self.base_url = base_url.rstrip("/")  # Ensure no trailing slash
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = client if client is not None else shared_http_client()
         # Set up headers: include the Authorization header if an API key is provided.
         self.headers = {"accept": "application/json"}
         if self.api_key:
             self.headers["Authorization"] = f"Bearer {self.api_key}"
 
+    def warm_up(self) -> None:
+        """
+        Open a pooled connection to the API ahead of the first real request.
+
+        Sends a HEAD request to the base URL so the TCP and TLS handshakes are
+        paid up front. Errors are ignored; the request only warms the pool.
+        """
+        with contextlib.suppress(httpx.HTTPError):
+            self.session.head(self.base_url, headers=self.headers)
+
+    @staticmethod
+    def _send(
+        request: Callable[[], httpx.Response],
+        retry_on: frozenset[int] = RETRYABLE_STATUS_CODES,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying while the API is rate limiting us or failing.
+
+        Responses with a status in `retry_on` are retried up to
+        HTTP_MAX_RETRIES times with jittered exponential backoff, honoring the
+        server's Retry-After header up to HTTP_MAX_DELAY. The last response is
+        returned as is.
+        """
+        for attempt in range(HTTP_MAX_RETRIES - 1):
+            response = request()
+            if response.status_code not in retry_on:
+                return response
+            time.sleep(_retry_delay(response, attempt))
+        return request()
+
     def _get(self, endpoint: str, params: dict | None = None) -> dict:
         """
         Make a GET request to the API and return the JSON response.
@@ -121,8 +226,8 @@ class BaseClient:
         params = params or {}
 
         url = self.base_url + endpoint
-        response = self.session.get(
-            url=url, params=params, headers=self.headers, timeout=30
+        response = self._send(
+            lambda: self.session.get(url=url, params=params, headers=self.headers)
         )
 
         success_status = 200
@@ -145,8 +250,9 @@ class BaseClient:
         :return: JSON response as a dictionary.
         """
         url = self.base_url + endpoint
-        response = self.session.post(
-            url=url, headers=self.headers, json=json_payload, timeout=30
+        response = self._send(
+            lambda: self.session.post(url=url, headers=self.headers, json=json_payload),
+            retry_on=RETRYABLE_POST_STATUS_CODES,
         )
 
         success_status = 200
@@ -169,11 +275,29 @@ class AsyncBaseClient:
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # HTTP/2 multiplexes concurrent requests over a single connection.
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
         self.headers = {"accept": "application/json"}
         if self.api_key:
             self.headers["Authorization"] = f"Bearer {self.api_key}"
 
+    @staticmethod
+    async def _send(
+        request: Callable[[], Awaitable[httpx.Response]],
+        retry_on: frozenset[int] = RETRYABLE_STATUS_CODES,
+    ) -> httpx.Response:
+        """Asynchronous variant of `BaseClient._send`."""
+        for attempt in range(HTTP_MAX_RETRIES - 1):
+            response = await request()
+            if response.status_code not in retry_on:
+                return response
+            await asyncio.sleep(_retry_delay(response, attempt))
+        return await request()
+
     async def _get(self, endpoint: str, params: dict | None = None) -> dict:
         """
         Make an asynchronous GET request to the API and return the JSON response.
@@ -184,7 +308,9 @@ class AsyncBaseClient:
         """
         params = params or {}
         url = self.base_url + endpoint
-        response = await self.client.get(url, params=params, headers=self.headers)
+        response = await self._send(
+            lambda: self.client.get(url, params=params, headers=self.headers)
+        )
 
         success_status = 200
         if response.status_code == success_status:
@@ -207,7 +333,10 @@ class AsyncBaseClient:
         :return: JSON response as a dictionary.
         """
         url = self.base_url + endpoint
-        response = await self.client.post(url, headers=self.headers, json=json_payload)
+        response = await self._send(
+            lambda: self.client.post(url, headers=self.headers, json=json_payload),
+            retry_on=RETRYABLE_POST_STATUS_CODES,
+        )
 
         success_status = 200
         if response.status_code == success_status:
@@ -0,0 +1,236 @@
+"""
+Persistent Embedding Cache Module
+
+This module provides a GeminiEmbedding variant that stores every computed vector
+in a local SQLite database, so identical content is only embedded once across
+restarts (e.g. the docs corpus on every boot, or duplicate Discord messages).
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import override
+
+import numpy as np
+import structlog
+from google.generativeai.embedding import EmbeddingTaskType
+
+from flare_ai_rag.ai.gemini import GeminiEmbedding
+
+logger = structlog.get_logger(__name__)
+
+# Keep well below SQLite's bound-parameter limit when looking up many keys.
+_LOOKUP_CHUNK_SIZE = 500
+# Default cap on stored vectors; about 150 MB of 768-dimensional float32 vectors.
+EMBEDDING_CACHE_MAX_ENTRIES = 50_000
+
+
+class CachedGeminiEmbedding(GeminiEmbedding):
+    """
+    GeminiEmbedding backed by an on-disk SQLite cache.
+
+    Vectors are keyed by SHA-256 of the embedding model, task type, title and
+    text, and stored as float32 bytes. Lookups happen before every request and
+    only cache misses are sent to Gemini. Once more than `max_entries` vectors
+    are stored, the oldest ones are evicted first.
+
+    Attributes:
+        hits (int): Number of embeddings served from the cache
+        misses (int): Number of embeddings requested from Gemini
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        cache_path: Path,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """
+        Initialize the cached embedding client.
+
+        Args:
+            api_key (str): Google API key for authentication
+            cache_path (Path): Location of the SQLite cache file
+            max_entries (int): Maximum number of vectors kept in the cache
+        """
+        super().__init__(api_key)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        logger.debug("embedding_cache_opened", cache_path=str(cache_path))
+
+    @override
+    def embed_contents(
+        self,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: str | list[str] | None = None,
+    ) -> np.ndarray:
+        """
+        Return cached embeddings, requesting only the missing ones from Gemini.
+
+        Args:
+            embedding_model (str): The embedding model to use.
+            contents (list[str]): The texts to be embedded.
+            task_type (EmbeddingTaskType): The embedding task type.
+            title (str | list[str] | None): Optional title, applied to every
+                text, or a list with one title per text.
+
+        Returns:
+            np.ndarray: (N, D) float32 array, one row per text in input order.
+        """
+        titles = title if isinstance(title, list) else [title] * len(contents)
+        keys = [
+            _cache_key(embedding_model, task_type, t, c)
+            for t, c in zip(titles, contents, strict=True)
+        ]
+        embeddings = self._lookup(keys)
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fresh = super().embed_contents(
+                embedding_model=embedding_model,
+                contents=[contents[idx] for idx in missing],
+                task_type=task_type,
+                title=_select_titles(title, missing),
+            )
+            self._store([keys[idx] for idx in missing], fresh)
+            for idx, embedding in zip(missing, fresh, strict=True):
+                embeddings[idx] = embedding
+        return _stack(embeddings)
+
+    @override
+    async def aembed_contents(
+        self,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: str | list[str] | None = None,
+    ) -> np.ndarray:
+        """
+        Asynchronous variant of `embed_contents`.
+
+        Cache reads and writes block on SQLite and on the lock shared with
+        other threads, so they run on a worker thread.
+
+        Args:
+            embedding_model (str): The embedding model to use.
+            contents (list[str]): The texts to be embedded.
+            task_type (EmbeddingTaskType): The embedding task type.
+            title (str | list[str] | None): Optional title, applied to every
+                text, or a list with one title per text.
+
+        Returns:
+            np.ndarray: (N, D) float32 array, one row per text in input order.
+        """
+        titles = title if isinstance(title, list) else [title] * len(contents)
+        keys = [
+            _cache_key(embedding_model, task_type, t, c)
+            for t, c in zip(titles, contents, strict=True)
+        ]
+        embeddings = await asyncio.to_thread(self._lookup, keys)
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fresh = await super().aembed_contents(
+                embedding_model=embedding_model,
+                contents=[contents[idx] for idx in missing],
+                task_type=task_type,
+                title=_select_titles(title, missing),
+            )
+            await asyncio.to_thread(self._store, [keys[idx] for idx in missing], fresh)
+            for idx, embedding in zip(missing, fresh, strict=True):
+                embeddings[idx] = embedding
+        return _stack(embeddings)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Report cache effectiveness.
+
+        Returns:
+            dict[str, int]: Hit and miss counters and the number of stored vectors.
+        """
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            return {"hits": self.hits, "misses": self.misses, "size": size}
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _lookup(self, keys: list[bytes]) -> list[np.ndarray | None]:
+        """Fetch cached vectors for the given keys, None where missing."""
+        found: dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_CHUNK_SIZE):
+                chunk = keys[start : start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})",  # noqa: S608
+                    chunk,
+                )
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, np.float32)
+            embeddings = [found.get(key) for key in keys]
+            hits = sum(embedding is not None for embedding in embeddings)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return embeddings
+
+    def _store(self, keys: list[bytes], embeddings: np.ndarray) -> None:
+        """Persist freshly computed vectors, evicting the oldest beyond the cap."""
+        rows = [
+            (key, embedding.tobytes())
+            for key, embedding in zip(keys, embeddings, strict=True)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows
+            )
+            # Rowids grow with every insert, so the lowest ones are the oldest.
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN ("
+                "SELECT rowid FROM embeddings ORDER BY rowid "
+                "LIMIT max(0, (SELECT COUNT(*) FROM embeddings) - ?))",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+
+def _stack(embeddings: list[np.ndarray | None]) -> np.ndarray:
+    """Stack per-text vectors, all filled in by now, into one (N, D) array."""
+    rows = [embedding for embedding in embeddings if embedding is not None]
+    if not rows:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack(rows)
+
+
+def _select_titles(
+    title: str | list[str] | None, indices: list[int]
+) -> str | list[str] | None:
+    """Narrow a per-text title list down to the texts at `indices`."""
+    if isinstance(title, list):
+        return [title[idx] for idx in indices]
+    return title
+
+
+def _cache_key(
+    embedding_model: str,
+    task_type: EmbeddingTaskType,
+    title: str | None,
+    text: str,
+) -> bytes:
+    """Build the cache key for one text; the title changes document vectors."""
+    return hashlib.sha256(
+        f"{embedding_model}|{task_type.name}|{title or ''}|{text}".encode()
+    ).digest()
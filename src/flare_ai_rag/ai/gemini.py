@@ -6,23 +6,80 @@ with Google's Generative AI service. It handles chat sessions, content generatio
 and message management while maintaining a consistent AI personality.
 """
 
-from typing import Any, override
+import asyncio
+import contextlib
+import functools
+import random
+import time
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterator,
+)
+from typing import Any, overload, override
 
+import numpy as np
 import structlog
-from google.generativeai.client import configure
+from google.api_core.exceptions import (
+    GoogleAPICallError,
+    InvalidArgument,
+    ResourceExhausted,
+    ServerError,
+    ServiceUnavailable,
+)
+from google.generativeai import protos
+from google.generativeai.client import (
+    configure,
+    get_default_generative_async_client,
+    get_default_generative_client,
+)
 from google.generativeai.embedding import (
     EmbeddingTaskType,
 )
 from google.generativeai.embedding import (
     embed_content as _embed_content,
 )
+from google.generativeai.embedding import (
+    embed_content_async as _embed_content_async,
+)
 from google.generativeai.generative_models import ChatSession, GenerativeModel
-from google.generativeai.types import GenerationConfig
+from google.generativeai.types import (
+    AsyncGenerateContentResponse,
+    GenerateContentResponse,
+    GenerationConfig,
+)
+from google.generativeai.types.content_types import to_content
+from google.generativeai.types.model_types import make_model_name
 
 from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
 
 logger = structlog.get_logger(__name__)
 
+# Gemini accepts at most 100 texts per batched embedding request.
+EMBEDDING_MAX_BATCH_SIZE = 100
+# Soft cap on the estimated tokens sent in a single batched embedding request.
+EMBEDDING_MAX_BATCH_TOKENS = 20_000
+# Rough characters-per-token ratio used to estimate request size.
+CHARS_PER_TOKEN = 4
+# Retry policy for rate-limited or unavailable embedding requests.
+EMBEDDING_MAX_RETRIES = 5
+EMBEDDING_START_JITTER = 0.05
+# Retry policy for rate-limited or failing generation requests.
+GENERATION_MAX_RETRIES = 3
+# Backoff shared by all retried Gemini requests; a server-provided Retry-After
+# is honored but never waited on for longer than RETRY_MAX_DELAY seconds.
+RETRY_BACKOFF_BASE = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Errors worth retrying. Generation is only retried on rate limiting (429) and
+# temporary unavailability (503): other server errors are rarely transient and
+# each retry repeats an expensive request. Embedding calls are cheap and
+# idempotent, so any server-side failure (5xx) is retried.
+_GENERATION_RETRYABLE_ERRORS = (ResourceExhausted, ServiceUnavailable)
+_EMBEDDING_RETRYABLE_ERRORS = (ResourceExhausted, ServerError)
+
 
 SYSTEM_INSTRUCTION = """
 You are an AI assistant specialized in helping users navigate
@@ -65,9 +122,8 @@ class GeminiProvider(BaseAIProvider):
         """
         configure(api_key=api_key)
         self.chat: ChatSession | None = None
-        self.model = GenerativeModel(
-            model_name=model,
-            system_instruction=kwargs.get("system_instruction", SYSTEM_INSTRUCTION),
+        self.model = _generative_model(
+            model, kwargs.get("system_instruction", SYSTEM_INSTRUCTION)
         )
         self.chat_history = []
         self.logger = logger.bind(service="gemini")
@@ -98,10 +154,7 @@ class GeminiProvider(BaseAIProvider):
         """
         new_system_instruction = kwargs.get("system_instruction", SYSTEM_INSTRUCTION)
         # Reinitialize the generative model.
-        self.model = GenerativeModel(
-            model_name=model,
-            system_instruction=new_system_instruction,
-        )
+        self.model = _generative_model(model, new_system_instruction)
         # Reset chat session and history with the new system instruction.
         self.chat = None
         self.chat_history = [{"role": "system", "content": new_system_instruction}]
@@ -115,6 +168,7 @@ class GeminiProvider(BaseAIProvider):
         prompt: str,
         response_mime_type: str | None = None,
         response_schema: Any | None = None,
+        max_output_tokens: int | None = None,
     ) -> ModelResponse:
         """
         Generate content using the Gemini model.
@@ -123,6 +177,7 @@ class GeminiProvider(BaseAIProvider):
             prompt (str): Input prompt for content generation
             response_mime_type (str | None): Expected MIME type for the response
             response_schema (Any | None): Schema defining the response structure
+            max_output_tokens (int | None): Cap on the generated tokens
 
         Returns:
             ModelResponse: Generated content with metadata including:
@@ -132,34 +187,168 @@ class GeminiProvider(BaseAIProvider):
                     - candidate_count: Number of generated candidates
                     - prompt_feedback: Feedback on the input prompt
         """
-        response = self.model.generate_content(
-            prompt,
-            generation_config=GenerationConfig(
-                response_mime_type=response_mime_type, response_schema=response_schema
+        response = _retry(
+            lambda: self.model.generate_content(
+                prompt,
+                generation_config=_generation_config(
+                    response_mime_type, response_schema, max_output_tokens
+                ),
             ),
+            GENERATION_MAX_RETRIES,
+            _GENERATION_RETRYABLE_ERRORS,
         )
-        self.logger.debug("generate", prompt=prompt, response_text=response.text)
-        return ModelResponse(
-            text=response.text,
-            raw_response=response,
-            metadata={
-                "candidate_count": len(response.candidates),
-                "prompt_feedback": response.prompt_feedback,
-            },
+        model_response = _to_model_response(response)
+        self.logger.debug("generate", prompt=prompt, response_text=model_response.text)
+        return model_response
+
+    @override
+    async def agenerate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        max_output_tokens: int | None = None,
+    ) -> ModelResponse:
+        """
+        Generate content using the Gemini model without blocking the event loop.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type for the response
+            response_schema (Any | None): Schema defining the response structure
+            max_output_tokens (int | None): Cap on the generated tokens
+
+        Returns:
+            ModelResponse: Generated content with metadata, as in `generate`.
+        """
+        response = await _aretry(
+            lambda: self.model.generate_content_async(
+                prompt,
+                generation_config=_generation_config(
+                    response_mime_type, response_schema, max_output_tokens
+                ),
+            ),
+            GENERATION_MAX_RETRIES,
+            _GENERATION_RETRYABLE_ERRORS,
         )
+        model_response = _to_model_response(response)
+        self.logger.debug("agenerate", prompt=prompt, response_text=model_response.text)
+        return model_response
+
+    def generate_stream(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        max_output_tokens: int | None = None,
+    ) -> Generator[str, None, None]:
+        """
+        Generate content using the Gemini model, yielding text as it streams in.
+
+        Callers that stop iterating early abandon the rest of the response.
+        Retries only cover opening the stream; an error raised while iterating
+        propagates to the caller, since chunks may already have been yielded.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type for the response
+            response_schema (Any | None): Schema defining the response structure
+            max_output_tokens (int | None): Cap on the generated tokens
+
+        Yields:
+            str: Text of each streamed chunk
+        """
+        response = _retry(
+            lambda: self.model.generate_content(
+                prompt,
+                generation_config=_generation_config(
+                    response_mime_type, response_schema, max_output_tokens
+                ),
+                stream=True,
+            ),
+            GENERATION_MAX_RETRIES,
+            _GENERATION_RETRYABLE_ERRORS,
+        )
+        for chunk in response:
+            if chunk.parts:
+                yield chunk.text
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        max_output_tokens: int | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Asynchronous variant of `generate_stream`.
+
+        Close the iterator (e.g. with `contextlib.aclosing`) when stopping early
+        so the underlying stream is released promptly. As with `generate_stream`,
+        only opening the stream is retried.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type for the response
+            response_schema (Any | None): Schema defining the response structure
+            max_output_tokens (int | None): Cap on the generated tokens
+
+        Yields:
+            str: Text of each streamed chunk
+        """
+        response = await _aretry(
+            lambda: self.model.generate_content_async(
+                prompt,
+                generation_config=_generation_config(
+                    response_mime_type, response_schema, max_output_tokens
+                ),
+                stream=True,
+            ),
+            GENERATION_MAX_RETRIES,
+            _GENERATION_RETRYABLE_ERRORS,
+        )
+        async for chunk in response:
+            if chunk.parts:
+                yield chunk.text
+
+    async def awarm_up(self) -> None:
+        """
+        Open the async connection to Gemini ahead of the first real request.
+
+        Sends a cheap token-count request through the same client that
+        `agenerate` uses, so the handshake is paid up front. Errors are
+        ignored; the request only warms the connection.
+        """
+        with contextlib.suppress(GoogleAPICallError):
+            await self.model.count_tokens_async("ping")
+
+    def new_chat(self) -> ChatSession:
+        """
+        Start an independent chat session seeded with the current chat history.
+
+        Sessions returned here share no state with `self.chat` or with each other,
+        so concurrent conversations can be served from a single provider.
+
+        Returns:
+            ChatSession: A fresh Gemini chat session
+        """
+        return self.model.start_chat(history=list(self.chat_history))
 
     @override
     def send_message(
         self,
         msg: str,
+        chat: ChatSession | None = None,
     ) -> ModelResponse:
         """
         Send a message in a chat session and get the response.
 
-        Initializes a new chat session if none exists, using the current chat history.
+        Uses `chat` when given; otherwise initializes the provider's own chat session
+        if none exists, using the current chat history.
 
         Args:
             msg (str): Message to send to the chat session
+            chat (ChatSession | None): Explicit session to send the message in
 
         Returns:
             ModelResponse: Response from the chat session including:
@@ -169,18 +358,126 @@ class GeminiProvider(BaseAIProvider):
                     - candidate_count: Number of generated candidates
                     - prompt_feedback: Feedback on the input message
         """
-        if not self.chat:
-            self.chat = self.model.start_chat(history=self.chat_history)
-        response = self.chat.send_message(msg)
-        self.logger.debug("send_message", msg=msg, response_text=response.text)
-        return ModelResponse(
-            text=response.text,
-            raw_response=response,
-            metadata={
-                "candidate_count": len(response.candidates),
-                "prompt_feedback": response.prompt_feedback,
-            },
+        if chat is None:
+            if not self.chat:
+                self.chat = self.model.start_chat(history=self.chat_history)
+            chat = self.chat
+        response = chat.send_message(msg)
+        model_response = _to_model_response(response)
+        self.logger.debug("send_message", msg=msg, response_text=model_response.text)
+        return model_response
+
+    @override
+    async def asend_message(
+        self,
+        msg: str,
+        chat: ChatSession | None = None,
+    ) -> ModelResponse:
+        """
+        Send a message in a chat session without blocking the event loop.
+
+        Args:
+            msg (str): Message to send to the chat session
+            chat (ChatSession | None): Explicit session to send the message in
+
+        Returns:
+            ModelResponse: Response from the chat session, as in `send_message`.
+        """
+        if chat is None:
+            if not self.chat:
+                self.chat = self.model.start_chat(history=self.chat_history)
+            chat = self.chat
+        response = await chat.send_message_async(msg)
+        model_response = _to_model_response(response)
+        self.logger.debug("asend_message", msg=msg, response_text=model_response.text)
+        return model_response
+
+
+def get_gemini_provider(
+    api_key: str, model: str, system_instruction: str = SYSTEM_INSTRUCTION
+) -> GeminiProvider:
+    """
+    Return a new GeminiProvider for a configuration.
+
+    Each caller gets its own chat session and history. The underlying
+    GenerativeModel, which holds no conversation state, is shared between
+    providers with the same model and system instruction, so its SDK clients
+    and their open connections are reused.
+
+    Args:
+        api_key (str): Google API key for authentication
+        model (str): Gemini model identifier to use
+        system_instruction (str): System prompt for the AI personality
+
+    Returns:
+        GeminiProvider: A provider with a fresh chat session
+    """
+    return GeminiProvider(
+        api_key=api_key, model=model, system_instruction=system_instruction
+    )
+
+
+@functools.cache
+def _generative_model(model: str, system_instruction: str) -> GenerativeModel:
+    """Return the shared, stateless GenerativeModel for a configuration."""
+    return GenerativeModel(model_name=model, system_instruction=system_instruction)
+
+
+def _generation_config(
+    response_mime_type: str | None,
+    response_schema: Any | None,
+    max_output_tokens: int | None = None,
+) -> GenerationConfig | None:
+    """
+    Return the generation config for a request, or None when nothing is set.
+
+    Configs are reused across calls since routes pass the same settings and
+    schema class every time; unhashable schemas (e.g. dicts) get a fresh one.
+    """
+    if (
+        response_mime_type is None
+        and response_schema is None
+        and max_output_tokens is None
+    ):
+        return None
+    try:
+        return _cached_generation_config(
+            response_mime_type, response_schema, max_output_tokens
         )
+    except TypeError:
+        return GenerationConfig(
+            response_mime_type=response_mime_type,
+            response_schema=response_schema,
+            max_output_tokens=max_output_tokens,
+        )
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_generation_config(
+    response_mime_type: str | None,
+    response_schema: Any | None,
+    max_output_tokens: int | None,
+) -> GenerationConfig:
+    """Build a generation config once per (mime type, schema, token cap)."""
+    return GenerationConfig(
+        response_mime_type=response_mime_type,
+        response_schema=response_schema,
+        max_output_tokens=max_output_tokens,
+    )
+
+
+def _to_model_response(
+    response: GenerateContentResponse | AsyncGenerateContentResponse,
+) -> ModelResponse:
+    """Wrap a Gemini response into the standardized ModelResponse."""
+    return ModelResponse(
+        text=response.text,
+        raw_response=response,
+        metadata={
+            "candidate_count": len(response.candidates),
+            "prompt_feedback": response.prompt_feedback,
+        },
+    )
 
 
 class GeminiEmbedding:
@@ -194,29 +491,434 @@ class GeminiEmbedding:
         """
         configure(api_key=api_key)
 
+    @overload
     def embed_content(
         self,
         embedding_model: str,
         contents: str,
         task_type: EmbeddingTaskType,
         title: str | None = None,
-    ) -> list[float]:
+    ) -> np.ndarray: ...
+
+    @overload
+    def embed_content(
+        self,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: str | None = None,
+    ) -> np.ndarray: ...
+
+    def embed_content(
+        self,
+        embedding_model: str,
+        contents: str | list[str],
+        task_type: EmbeddingTaskType,
+        title: str | None = None,
+    ) -> np.ndarray:
         """
         Generate text embeddings using Gemini.
 
+        Vectors are returned as float32 arrays rather than lists of Python floats.
+        A list of texts is forwarded to `embed_contents` so that it is embedded
+        in a single batched request.
+
         Args:
             model (str): The embedding model to use (e.g., "text-embedding-004").
-            contents (str): The text to be embedded.
+            contents (str | list[str]): The text (or texts) to be embedded.
 
         Returns:
-            list[float]: The generated embedding vector.
+            np.ndarray: The float32 embedding vector, or an (N, D) array with one
+                row per text when a list was given.
         """
+        if isinstance(contents, list):
+            return self.embed_contents(
+                embedding_model=embedding_model,
+                contents=contents,
+                task_type=task_type,
+                title=title,
+            )
+        return self.embed_contents(
+            embedding_model=embedding_model,
+            contents=[contents],
+            task_type=task_type,
+            title=title,
+        )[0]
+
+    def embed_contents(
+        self,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: str | list[str] | None = None,
+    ) -> np.ndarray:
+        """
+        Generate text embeddings for a batch of texts in one round-trip.
+
+        Args:
+            embedding_model (str): The embedding model to use.
+            contents (list[str]): The texts to be embedded.
+            task_type (EmbeddingTaskType): The embedding task type.
+            title (str | list[str] | None): Optional title, applied to every
+                text, or a list with one title per text.
+
+        Returns:
+            np.ndarray: (N, D) float32 array, one row per text in input order.
+        """
+        if not contents:
+            return np.empty((0, 0), dtype=np.float32)
+        if isinstance(title, list):
+            client = get_default_generative_client()
+            embeddings: list[list[float]] = []
+            for request in _titled_requests(
+                embedding_model, contents, task_type, title
+            ):
+                response = client.batch_embed_contents(request)
+                embeddings.extend(list(e.values) for e in response.embeddings)
+            return _extract_embeddings({"embedding": embeddings}, len(contents))
         response = _embed_content(
             model=embedding_model, content=contents, task_type=task_type, title=title
         )
+        return _extract_embeddings(response, len(contents))
+
+    @overload
+    async def aembed_content(
+        self,
+        embedding_model: str,
+        contents: str,
+        task_type: EmbeddingTaskType,
+        title: str | None = None,
+    ) -> np.ndarray: ...
+
+    @overload
+    async def aembed_content(
+        self,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: str | None = None,
+    ) -> np.ndarray: ...
+
+    async def aembed_content(
+        self,
+        embedding_model: str,
+        contents: str | list[str],
+        task_type: EmbeddingTaskType,
+        title: str | None = None,
+    ) -> np.ndarray:
+        """
+        Generate text embeddings using Gemini without blocking the event loop.
+
+        Args:
+            embedding_model (str): The embedding model to use.
+            contents (str | list[str]): The text (or texts) to be embedded.
+            task_type (EmbeddingTaskType): The embedding task type.
+            title (str | None): Optional title, applied to every text.
+
+        Returns:
+            np.ndarray: The float32 embedding vector, or an (N, D) array with one
+                row per text when a list was given.
+        """
+        if isinstance(contents, list):
+            return await self.aembed_contents(
+                embedding_model=embedding_model,
+                contents=contents,
+                task_type=task_type,
+                title=title,
+            )
+        embeddings = await self.aembed_contents(
+            embedding_model=embedding_model,
+            contents=[contents],
+            task_type=task_type,
+            title=title,
+        )
+        return embeddings[0]
+
+    async def aembed_contents(
+        self,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: str | list[str] | None = None,
+    ) -> np.ndarray:
+        """
+        Asynchronous variant of `embed_contents`.
+
+        Args:
+            embedding_model (str): The embedding model to use.
+            contents (list[str]): The texts to be embedded.
+            task_type (EmbeddingTaskType): The embedding task type.
+            title (str | list[str] | None): Optional title, applied to every
+                text, or a list with one title per text.
+
+        Returns:
+            np.ndarray: (N, D) float32 array, one row per text in input order.
+        """
+        if not contents:
+            return np.empty((0, 0), dtype=np.float32)
+        if isinstance(title, list):
+            client = get_default_generative_async_client()
+            embeddings: list[list[float]] = []
+            for request in _titled_requests(
+                embedding_model, contents, task_type, title
+            ):
+                response = await client.batch_embed_contents(request)
+                embeddings.extend(list(e.values) for e in response.embeddings)
+            return _extract_embeddings({"embedding": embeddings}, len(contents))
+        response = await _embed_content_async(
+            model=embedding_model, content=contents, task_type=task_type, title=title
+        )
+        return _extract_embeddings(response, len(contents))
+
+    async def embed_batch_concurrent(  # noqa: PLR0913
+        self,
+        embedding_model: str,
+        texts: list[str],
+        task_type: EmbeddingTaskType,
+        batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+        max_in_flight: int = 4,
+        titles: list[str] | None = None,
+    ) -> list[np.ndarray | None]:
+        """
+        Embed many texts with several batched requests in flight at once.
+
+        Texts are split into batches of at most `batch_size` texts (and roughly
+        EMBEDDING_MAX_BATCH_TOKENS tokens). Up to `max_in_flight` batches are
+        embedded concurrently on worker threads, each retried with exponential
+        backoff when rate limited. A batch rejected as invalid (e.g. too large)
+        is split in half and retried until the offending text is isolated. The
+        blocking client is used so the coroutine does not depend on the event
+        loop it runs in.
+
+        Args:
+            embedding_model (str): The embedding model to use.
+            texts (list[str]): The texts to be embedded.
+            task_type (EmbeddingTaskType): The embedding task type.
+            batch_size (int): Maximum number of texts per request.
+            max_in_flight (int): Maximum number of concurrent requests.
+            titles (list[str] | None): Optional title per text, sent along
+                with it in the batched request.
+
+        Returns:
+            list[np.ndarray | None]: One float32 embedding per text, in input
+                order.
+                Texts whose batch could not be embedded are left as None.
+        """
+        embeddings: list[np.ndarray | None] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def embed_slice(start: int, stop: int) -> None:
+            await asyncio.sleep(random.uniform(0, EMBEDDING_START_JITTER))  # noqa: S311
+            async with semaphore:
+                try:
+                    batch = await self._embed_with_retry(
+                        embedding_model,
+                        texts[start:stop],
+                        task_type,
+                        titles[start:stop] if titles is not None else None,
+                    )
+                except InvalidArgument as e:
+                    if stop - start == 1:
+                        logger.warning(
+                            "Failed to embed text.", start=start, error=str(e)
+                        )
+                        return
+                    batch = None
+                except GoogleAPICallError as e:
+                    logger.warning(
+                        "Failed to embed batch.",
+                        start=start,
+                        batch_size=stop - start,
+                        error=str(e),
+                    )
+                    return
+            if batch is None:
+                # Usually an oversized payload: bisect so that only the offending
+                # text is left unembedded.
+                middle = (start + stop) // 2
+                await asyncio.gather(
+                    embed_slice(start, middle), embed_slice(middle, stop)
+                )
+                return
+            embeddings[start:stop] = list(batch)
+
+        await asyncio.gather(
+            *(
+                embed_slice(start, stop)
+                for start, stop in _batch_slices(texts, batch_size)
+            )
+        )
+        return embeddings
+
+    def embed_contents_with_retry(
+        self,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: str | list[str] | None = None,
+    ) -> np.ndarray:
+        """
+        Blocking variant of `embed_contents` that backs off while Gemini is
+        rate limiting us, using the same policy as `embed_batch_concurrent`.
+
+        Args:
+            embedding_model (str): The embedding model to use.
+            contents (list[str]): The texts to be embedded.
+            task_type (EmbeddingTaskType): The embedding task type.
+            title (str | list[str] | None): Optional title, applied to every
+                text, or a list with one title per text.
+
+        Returns:
+            np.ndarray: (N, D) float32 array, one row per text in input order.
+        """
+        return _retry(
+            lambda: self.embed_contents(
+                embedding_model=embedding_model,
+                contents=contents,
+                task_type=task_type,
+                title=title,
+            ),
+            EMBEDDING_MAX_RETRIES,
+            _EMBEDDING_RETRYABLE_ERRORS,
+        )
+
+    async def _embed_with_retry(
+        self,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: list[str] | None,
+    ) -> np.ndarray:
+        """Embed one batch, backing off while Gemini is rate limiting us."""
+        return await _aretry(
+            lambda: asyncio.to_thread(
+                self.embed_contents,
+                embedding_model=embedding_model,
+                contents=contents,
+                task_type=task_type,
+                title=title,
+            ),
+            EMBEDDING_MAX_RETRIES,
+            _EMBEDDING_RETRYABLE_ERRORS,
+        )
+
+
+def _retry[T](
+    call: Callable[[], T],
+    max_retries: int,
+    retry_on: tuple[type[GoogleAPICallError], ...],
+) -> T:
+    """Call `call`, backing off while it raises one of the `retry_on` errors."""
+    for attempt in range(max_retries - 1):
+        try:
+            return call()
+        except retry_on as e:
+            time.sleep(_backoff_delay(e, attempt))
+    return call()
+
+
+async def _aretry[T](
+    call: Callable[[], Awaitable[T]],
+    max_retries: int,
+    retry_on: tuple[type[GoogleAPICallError], ...],
+) -> T:
+    """Asynchronous variant of `_retry`."""
+    for attempt in range(max_retries - 1):
         try:
-            embedding = response["embedding"]
-        except (KeyError, IndexError) as e:
-            msg = "Failed to extract embedding from response."
-            raise ValueError(msg) from e
-        return embedding
+            return await call()
+        except retry_on as e:
+            await asyncio.sleep(_backoff_delay(e, attempt))
+    return await call()
+
+
+def _backoff_delay(error: GoogleAPICallError, attempt: int) -> float:
+    """Log a throttled or failed Gemini request and return how long to wait."""
+    base = _retry_after(error) or RETRY_BACKOFF_BASE * 2**attempt
+    delay = min(base + random.uniform(0, base / 2), RETRY_MAX_DELAY)  # noqa: S311
+    logger.warning(
+        "Gemini request failed, retrying.",
+        error=type(error).__name__,
+        attempt=attempt + 1,
+        delay=delay,
+    )
+    return delay
+
+
+def _titled_requests(
+    embedding_model: str,
+    contents: list[str],
+    task_type: EmbeddingTaskType,
+    titles: list[str],
+) -> Iterator[protos.BatchEmbedContentsRequest]:
+    """
+    Build batched embedding requests that carry a title per text.
+
+    `embed_content` only accepts one title for a whole batch, so the requests
+    are assembled here, at most EMBEDDING_MAX_BATCH_SIZE texts each.
+    """
+    if len(titles) != len(contents):
+        msg = f"Expected {len(contents)} titles, received {len(titles)}."
+        raise ValueError(msg)
+    model = make_model_name(embedding_model)
+    for start in range(0, len(contents), EMBEDDING_MAX_BATCH_SIZE):
+        stop = start + EMBEDDING_MAX_BATCH_SIZE
+        yield protos.BatchEmbedContentsRequest(
+            model=model,
+            requests=[
+                protos.EmbedContentRequest(
+                    model=model,
+                    content=to_content(text),
+                    task_type=task_type,
+                    title=title,
+                )
+                for text, title in zip(
+                    contents[start:stop], titles[start:stop], strict=True
+                )
+            ],
+        )
+
+
+def _extract_embeddings(response: Any, expected: int) -> np.ndarray:
+    """Extract the embedding vectors from a batched response as a float32 array."""
+    try:
+        embeddings = np.asarray(response["embedding"], dtype=np.float32)
+    except (KeyError, IndexError) as e:
+        msg = "Failed to extract embeddings from response."
+        raise ValueError(msg) from e
+    if len(embeddings) != expected:
+        msg = f"Expected {expected} embeddings, received {len(embeddings)}."
+        raise ValueError(msg)
+    return embeddings
+
+
+def _batch_slices(texts: list[str], batch_size: int) -> list[tuple[int, int]]:
+    """
+    Split texts into (start, stop) slices respecting both the batch size and
+    the EMBEDDING_MAX_BATCH_TOKENS estimate.
+    """
+    slices: list[tuple[int, int]] = []
+    start, batch_tokens = 0, 0
+    for idx, text in enumerate(texts):
+        tokens = len(text) // CHARS_PER_TOKEN + 1
+        if idx > start and (
+            idx - start >= batch_size
+            or batch_tokens + tokens > EMBEDDING_MAX_BATCH_TOKENS
+        ):
+            slices.append((start, idx))
+            start, batch_tokens = idx, 0
+        batch_tokens += tokens
+    if start < len(texts):
+        slices.append((start, len(texts)))
+    return slices
+
+
+def _retry_after(error: GoogleAPICallError) -> float | None:
+    """Return the server-provided Retry-After delay in seconds, if any."""
+    response = error.response
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("Retry-After", ""))
+    except ValueError:
+        return None
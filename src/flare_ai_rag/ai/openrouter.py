@@ -1,10 +1,19 @@
+import functools
+
+import httpx
+
 from flare_ai_rag.ai import AsyncBaseClient, BaseClient
 
 
 class OpenRouterClient(BaseClient):
     """Sync Client to interact with the OpenRouter API."""
 
-    def __init__(self, api_key: str | None = None, base_url: str | None = None) -> None:
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        client: httpx.Client | None = None,
+    ) -> None:
         """
         Initialize the OpenRouter client.
 
@@ -13,10 +22,12 @@ class OpenRouterClient(BaseClient):
         :param api_key: Optional API key for authentication.
         :param base_url: Optional custom base URL.
             Defaults to "https://openrouter.ai/api/v1"
+        :param client: Optional HTTP client. By default all instances share
+            one pooled client.
         """
         if base_url is None:
             base_url = "https://openrouter.ai/api/v1"
-        super().__init__(base_url, api_key)
+        super().__init__(base_url, api_key, client)
 
     def get_available_models(self) -> dict:
         """
@@ -72,6 +83,20 @@ class OpenRouterClient(BaseClient):
         return self._post(endpoint, payload)
 
 
+@functools.cache
+def get_openrouter_client(
+    api_key: str | None = None, base_url: str | None = None
+) -> OpenRouterClient:
+    """
+    Return the shared OpenRouterClient for a configuration, creating it once.
+
+    :param api_key: Optional API key for authentication.
+    :param base_url: Optional custom base URL.
+    :return: The client registered for these arguments.
+    """
+    return OpenRouterClient(api_key=api_key, base_url=base_url)
+
+
 class AsyncOpenRouterClient(AsyncBaseClient):
     """Asynchronous client to interact with the OpenRouter API."""
 
@@ -1,5 +1,12 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+
+import numpy as np
 import structlog
 from fastapi import APIRouter, HTTPException
+from google.generativeai.generative_models import ChatSession
 from pydantic import BaseModel, Field
 
 from flare_ai_rag.ai import GeminiProvider
@@ -7,11 +14,16 @@ from flare_ai_rag.attestation import Vtpm, VtpmAttestationError
 from flare_ai_rag.prompts import PromptService, SemanticRouterResponse
 from flare_ai_rag.responder import GeminiResponder
 from flare_ai_rag.retriever import QdrantRetriever
-from flare_ai_rag.router import GeminiRouter
+from flare_ai_rag.router import EmbeddingRouterGate, GeminiRouter
+from flare_ai_rag.utils import SemanticCache
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 
+# Bounds for the per-conversation chat sessions kept in memory.
+MAX_CHAT_SESSIONS = 1000
+CHAT_SESSION_TTL_SECONDS = 3600.0
+
 
 class ChatMessage(BaseModel):
     """
@@ -19,9 +31,12 @@ class ChatMessage(BaseModel):
 
     Attributes:
         message (str): The chat message content, must not be empty
+        session_id (str | None): Optional conversation identifier; messages with
+            the same id share chat history
     """
 
     message: str = Field(..., min_length=1)
+    session_id: str | None = Field(default=None, max_length=128)
 
 
 class ChatRouter:
@@ -41,6 +56,9 @@ class ChatRouter:
         responder: GeminiResponder,
         attestation: Vtpm,
         prompts: PromptService,
+        semantic_cache: SemanticCache | None = None,
+        classification_cache: SemanticCache | None = None,
+        router_gate: EmbeddingRouterGate | None = None,
     ) -> None:
         """
         Initialize the ChatRouter.
@@ -55,6 +73,15 @@ class ChatRouter:
             responder: RAG Component that generates a response.
             attestation (Vtpm): Provider for attestation services
             prompts (PromptService): Service for managing prompts
+            semantic_cache (SemanticCache | None): Optional cache of answers keyed
+                by query embedding, used to skip the pipeline for near-duplicate
+                queries.
+            classification_cache (SemanticCache | None): Optional cache of query
+                classifications keyed by query embedding, used to skip the
+                router call for near-duplicate queries.
+            router_gate (EmbeddingRouterGate | None): Optional local classifier
+                over query embeddings, used to skip the router call for queries
+                it classifies confidently.
         """
         self._router = router
         self.ai = ai
@@ -63,6 +90,10 @@ class ChatRouter:
         self.responder = responder
         self.attestation = attestation
         self.prompts = prompts
+        self.semantic_cache = semantic_cache
+        self.classification_cache = classification_cache
+        self.router_gate = router_gate
+        self._sessions: OrderedDict[str, tuple[ChatSession, float]] = OrderedDict()
         self.logger = logger.bind(router="chat")
         self._setup_routes()
 
@@ -90,7 +121,9 @@ class ChatRouter:
                     return {"response": resp}
 
                 route = await self.get_semantic_route(message.message)
-                return await self.route_message(route, message.message)
+                return await self.route_message(
+                    route, message.message, session_id=message.session_id
+                )
 
             except Exception as e:
                 self.logger.exception("Chat processing failed", error=str(e))
@@ -115,7 +148,7 @@ class ChatRouter:
             prompt, mime_type, schema = self.prompts.get_formatted_prompt(
                 "semantic_router", user_input=message
             )
-            route_response = self.ai.generate(
+            route_response = await self.ai.agenerate(
                 prompt=prompt, response_mime_type=mime_type, response_schema=schema
             )
             return SemanticRouterResponse(route_response.text)
@@ -124,7 +157,10 @@ class ChatRouter:
             return SemanticRouterResponse.CONVERSATIONAL
 
     async def route_message(
-        self, route: SemanticRouterResponse, message: str
+        self,
+        route: SemanticRouterResponse,
+        message: str,
+        session_id: str | None = None,
     ) -> dict[str, str]:
         """
         Route a message to the appropriate handler based on semantic route.
@@ -132,6 +168,7 @@ class ChatRouter:
         Args:
             route: Determined semantic route
             message: Original message to handle
+            session_id: Optional conversation identifier for chat history
 
         Returns:
             dict[str, str]: Response from the appropriate handler
@@ -139,7 +176,9 @@ class ChatRouter:
         handlers = {
             SemanticRouterResponse.RAG_ROUTER: self.handle_rag_pipeline,
             SemanticRouterResponse.REQUEST_ATTESTATION: self.handle_attestation,
-            SemanticRouterResponse.CONVERSATIONAL: self.handle_conversation,
+            SemanticRouterResponse.CONVERSATIONAL: functools.partial(
+                self.handle_conversation, session_id=session_id
+            ),
         }
 
         handler = handlers.get(route)
@@ -158,21 +197,45 @@ class ChatRouter:
         Returns:
             dict[str, str]: Response containing attestation request
         """
-        # Step 1. Classify the user query.
-        prompt, mime_type, schema = self.prompts.get_formatted_prompt("rag_router")
-        classification = self.query_router.route_query(
-            prompt=prompt, response_mime_type=mime_type, response_schema=schema
+        # Step 0. Classify the query and embed it concurrently: the embedding
+        # serves both the semantic cache and retrieval.
+        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
+            "rag_router", user_input=_
         )
+        classify_task = asyncio.create_task(
+            self.query_router.aroute_query(
+                prompt=prompt, response_mime_type=mime_type, response_schema=schema
+            )
+        )
+        try:
+            query_vector = await self.retriever.aembed_query(_)
+        except BaseException:
+            classify_task.cancel()
+            raise
+
+        # Step 1. Serve near-duplicate queries from the semantic cache.
+        if self.semantic_cache is not None:
+            cached_answer = self.semantic_cache.lookup(query_vector)
+            if cached_answer is not None:
+                classify_task.cancel()
+                self.logger.info("Semantic cache hit")
+                return {"classification": "ANSWER", "response": cached_answer}
+
+        classification = await self._classify(classify_task, query_vector)
         self.logger.info("Query classified", classification=classification)
 
         if classification == "ANSWER":
             # Step 2. Retrieve relevant documents.
-            retrieved_docs = self.retriever.semantic_search(_, top_k=5)
+            retrieved_docs = await asyncio.to_thread(
+                self.retriever.search_by_vector, query_vector, top_k=5
+            )
             self.logger.info("Documents retrieved")
 
             # Step 3. Generate the final answer.
-            answer = self.responder.generate_response(_, retrieved_docs)
+            answer = await self.responder.agenerate_response(_, retrieved_docs)
             self.logger.info("Response generated", answer=answer)
+            if self.semantic_cache is not None:
+                self.semantic_cache.insert(query_vector, answer)
             return {"classification": classification, "response": answer}
 
         # Map static responses for CLARIFY and REJECT.
@@ -190,6 +253,40 @@ class ChatRouter:
         self.logger.exception("RAG Routing failed")
         raise ValueError(classification)
 
+    async def _classify(
+        self, classify_task: asyncio.Task[str], query_vector: np.ndarray
+    ) -> str:
+        """
+        Return the query classification without waiting for the router when
+        the local gate is confident or a near-duplicate query was classified.
+
+        Args:
+            classify_task: The in-flight router call for this query
+            query_vector: Embedding of the query
+
+        Returns:
+            str: The classification
+        """
+        if self.router_gate is not None:
+            gated = self.router_gate.classify(query_vector)
+            if gated is not None:
+                classify_task.cancel()
+                self.logger.info("Router gate hit", classification=gated)
+                return gated
+
+        if self.classification_cache is None:
+            return await classify_task
+
+        cached = self.classification_cache.lookup(query_vector)
+        if cached is not None:
+            classify_task.cancel()
+            self.logger.info("Classification cache hit")
+            return cached
+
+        classification = await classify_task
+        self.classification_cache.insert(query_vector, classification)
+        return classification
+
     async def handle_attestation(self, _: str) -> dict[str, str]:
         """
         Handle attestation requests.
@@ -201,19 +298,58 @@ class ChatRouter:
             dict[str, str]: Response containing attestation request
         """
         prompt = self.prompts.get_formatted_prompt("request_attestation")[0]
-        request_attestation_response = self.ai.generate(prompt=prompt)
+        request_attestation_response = await self.ai.agenerate(prompt=prompt)
         self.attestation.attestation_requested = True
         return {"response": request_attestation_response.text}
 
-    async def handle_conversation(self, message: str) -> dict[str, str]:
+    async def handle_conversation(
+        self, message: str, session_id: str | None = None
+    ) -> dict[str, str]:
         """
         Handle general conversation messages.
 
+        Each conversation gets its own chat session, so concurrent users never
+        share or interleave history on the provider instance.
+
         Args:
             message: Message to process
+            session_id: Optional conversation identifier; without one the message
+                is answered in a fresh, single-turn session
 
         Returns:
             dict[str, str]: Response from AI provider
         """
-        response = self.ai.send_message(message)
+        response = await self.ai.asend_message(
+            message, chat=self._get_chat_session(session_id)
+        )
         return {"response": response.text}
+
+    def _get_chat_session(self, session_id: str | None) -> ChatSession:
+        """
+        Return the chat session for a conversation, creating it if needed.
+
+        Sessions are kept in an LRU map bounded by MAX_CHAT_SESSIONS and expire
+        after CHAT_SESSION_TTL_SECONDS of inactivity.
+
+        Args:
+            session_id: Conversation identifier, or None for a one-off session
+
+        Returns:
+            ChatSession: The session to send the message in
+        """
+        if session_id is None:
+            return self.ai.new_chat()
+
+        now = time.monotonic()
+        while self._sessions:
+            oldest_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < CHAT_SESSION_TTL_SECONDS:
+                break
+            del self._sessions[oldest_id]
+
+        entry = self._sessions.pop(session_id, None)
+        chat = entry[0] if entry is not None else self.ai.new_chat()
+        self._sessions[session_id] = (chat, now)
+        while len(self._sessions) > MAX_CHAT_SESSIONS:
+            self._sessions.popitem(last=False)
+        return chat
@@ -1,14 +1,21 @@
+import asyncio
+
 import discord
-import os
-import requests
+import httpx
+import structlog
 from typing import NoReturn
 from qdrant_client import QdrantClient
-from flare_ai_rag.ai import GeminiEmbedding
-from flare_ai_rag.retriever.qdrant_collection import store_discord_message
+from flare_ai_rag.ai import CachedGeminiEmbedding, GeminiEmbedding
+from flare_ai_rag.retriever.qdrant_collection import (
+    DiscordMessage,
+    store_discord_messages,
+)
 from flare_ai_rag.retriever.config import RetrieverConfig
 from flare_ai_rag.settings import settings
 from flare_ai_rag.utils import load_json
-from flare_ai_rag.state import app_state
+from flare_ai_rag.state import app_state, get_qdrant_client
+
+logger = structlog.get_logger(__name__)
 
 TOKEN = settings.discord_bot_token
 
@@ -24,21 +31,164 @@ intents.message_content = True  # Enable message content intent
 
 client = discord.Client(intents=intents)
 
-def initialize_clients() -> None:
-    """Initialize the required clients and store them in app_state"""
-    if not all([app_state.qdrant_client, app_state.retriever_config, app_state.embedding_client]):
+# Pooled keep-alive connection to the local chat API, shared by all handlers.
+_http = httpx.AsyncClient(
+    base_url="http://localhost",
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=20),
+)
+
+
+async def reply_with_chat_response(message: discord.Message) -> None:
+    """Forward a message to the chat API and reply with its response."""
+    response = await _http.post(
+        "/api/routes/chat/",
+        json={
+            "message": message.content,
+            "session_id": f"discord-{message.channel.id}",
+        },
+    )
+
+    if response.is_success:
+        await message.reply(response.json()["response"])
+    else:
+        logger.error(
+            "Chat request failed.",
+            status_code=response.status_code,
+            response=response.text,
+        )
+
+
+# Messages to store are embedded and upserted together in batches of up to
+# STORE_BATCH_SIZE, waiting at most STORE_FLUSH_SECONDS for a batch to fill.
+STORE_BATCH_SIZE = 32
+STORE_FLUSH_SECONDS = 0.2
+
+
+class DiscordMessageBatcher:
+    """
+    Collects Discord messages from concurrent handlers into batched stores.
+
+    A background task takes the first queued message, waits up to
+    `flush_seconds` for more (at most `max_batch_size` in total) and stores
+    them with one embedding request and one upsert. Messages that arrive while
+    a batch is being stored are picked up by the next one.
+    """
+
+    def __init__(
+        self,
+        qdrant_client: QdrantClient,
+        retriever_config: RetrieverConfig,
+        embedding_client: GeminiEmbedding,
+        max_batch_size: int = STORE_BATCH_SIZE,
+        flush_seconds: float = STORE_FLUSH_SECONDS,
+    ) -> None:
+        self.qdrant_client = qdrant_client
+        self.retriever_config = retriever_config
+        self.embedding_client = embedding_client
+        self.max_batch_size = max_batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: asyncio.Queue[tuple[DiscordMessage, asyncio.Future[None]]] = (
+            asyncio.Queue()
+        )
+        self._task: asyncio.Task[None] | None = None
+
+    async def submit(self, message: DiscordMessage) -> None:
+        """Queue a message and wait until the batch holding it is stored."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, future))
+        await future
+
+    async def _next_batch(self) -> list[tuple[DiscordMessage, asyncio.Future[None]]]:
+        """Wait for a message, then gather more until the batch is full or due."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.flush_seconds
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await store_discord_messages(
+                    [message for message, _ in batch],
+                    qdrant_client=self.qdrant_client,
+                    retriever_config=self.retriever_config,
+                    embedding_client=self.embedding_client,
+                )
+            except Exception as e:  # noqa: BLE001
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                # Cached answers may no longer reflect the collection.
+                if app_state.semantic_cache is not None:
+                    app_state.semantic_cache.clear()
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
+
+_batcher: DiscordMessageBatcher | None = None
+
+# Guards the one-time client initialization shared by all event handlers.
+_init_lock = asyncio.Lock()
+_initialized = False
+
+
+async def initialize_clients() -> None:
+    """Initialize the required clients once and store them in app_state"""
+    global _initialized, _batcher  # noqa: PLW0603
+    if _initialized:
+        return
+
+    async with _init_lock:
+        if _initialized:
+            return
+        # Reuse the clients set up by the FastAPI app when they are available.
+        if not all(
+            [
+                app_state.qdrant_client,
+                app_state.retriever_config,
+                app_state.embedding_client,
+            ]
+        ):
+            config_json = load_json(settings.input_path / "input_parameters.json")
+            retriever_config = RetrieverConfig.load(config_json["retriever_config"])
+
+            get_qdrant_client(retriever_config)
+            app_state.retriever_config = retriever_config
+            app_state.embedding_client = CachedGeminiEmbedding(
+                api_key=settings.gemini_api_key,
+                cache_path=settings.embedding_cache_path,
+            )
+        if (
+            app_state.qdrant_client is not None
+            and app_state.retriever_config is not None
+            and app_state.embedding_client is not None
+        ):
+            _batcher = DiscordMessageBatcher(
+                qdrant_client=app_state.qdrant_client,
+                retriever_config=app_state.retriever_config,
+                embedding_client=app_state.embedding_client,
+            )
+        _initialized = True
 
-        config_json = load_json(settings.input_path / "input_parameters.json")
-        retriever_config = RetrieverConfig.load(config_json["retriever_config"])
-        
-        app_state.qdrant_client = QdrantClient(host=retriever_config.host, port=retriever_config.port)
-        app_state.retriever_config = retriever_config
-        app_state.embedding_client = GeminiEmbedding(api_key=settings.gemini_api_key)
 
 @client.event
 async def on_ready() -> None:
     print(f'Logged in as {client.user}')
-    initialize_clients()
+    await initialize_clients()
 
 @client.event
 async def on_message(message: discord.Message) -> None:
@@ -52,34 +202,22 @@ async def on_message(message: discord.Message) -> None:
         norag_content = message.content[len("!norag"):].strip()
         
         if norag_content:
-            url = "http://localhost/api/routes/chat/"
-            data = {"message": message.content}
-
-            response = requests.post(url, json=data)
-
-            if response.status_code == 200:
-                await message.reply(response.json()["response"])
-            else:
-                print(f"Error: {response.status_code}, {response.text}")
+            await reply_with_chat_response(message)
         else:
             await message.reply("Please provide content after `!norag`.")
         return
 
     if str(message.author.id) in AUTHORIZED_USER_IDS:
         try:
-            initialize_clients()
+            await initialize_clients()
             
-            if (app_state.qdrant_client is not None and 
-                app_state.retriever_config is not None and 
-                app_state.embedding_client is not None):
-                
-                await store_discord_message(
-                    jump_url=message.jump_url,
-                    message_content=message.content,
-                    author_id=str(message.author.id),
-                    qdrant_client=app_state.qdrant_client,
-                    retriever_config=app_state.retriever_config,
-                    embedding_client=app_state.embedding_client,
+            if _batcher is not None:
+                await _batcher.submit(
+                    DiscordMessage(
+                        content=message.content,
+                        author_id=str(message.author.id),
+                        jump_url=message.jump_url,
+                    )
                 )
                 stored_successfully = True
             else:
@@ -89,18 +227,14 @@ async def on_message(message: discord.Message) -> None:
 
     if stored_successfully:
         return
-    
-    url = "http://localhost/api/routes/chat/"
-    data = {"message": message.content}
 
-    response = requests.post(url, json=data)
+    await reply_with_chat_response(message)
 
-    if response.status_code == 200:
-        await message.reply(response.json()["response"])
-    else:
-        print(f"Error: {response.status_code}, {response.text}")
 
-        
 async def start_bot() -> NoReturn:
-    await client.start(TOKEN)
+    try:
+        await client.start(TOKEN)
+    finally:
+        # Not on on_disconnect: that also fires on transient gateway reconnects.
+        await _http.aclose()
 
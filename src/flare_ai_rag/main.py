@@ -6,6 +6,8 @@ It sets up CORS middleware, loads configuration and data, and wires together the
 Gemini-based Router, Retriever, and Responder components into a chat endpoint.
 """
 
+from pathlib import Path
+
 import pandas as pd
 import structlog
 import uvicorn
@@ -15,16 +17,21 @@ from qdrant_client import QdrantClient
 
 import asyncio
 
-from flare_ai_rag.ai import GeminiEmbedding, GeminiProvider
+from flare_ai_rag.ai import CachedGeminiEmbedding, GeminiProvider
 from flare_ai_rag.api import ChatRouter
 from flare_ai_rag.attestation import Vtpm
 from flare_ai_rag.prompts import PromptService
 from flare_ai_rag.responder import GeminiResponder, ResponderConfig
 from flare_ai_rag.retriever import QdrantRetriever, RetrieverConfig, generate_collection
-from flare_ai_rag.router import GeminiRouter, RouterConfig
+from flare_ai_rag.router import (
+    ROUTER_LABEL_DESCRIPTIONS,
+    EmbeddingRouterGate,
+    GeminiRouter,
+    RouterConfig,
+)
 from flare_ai_rag.settings import settings
-from flare_ai_rag.utils import load_json
-from flare_ai_rag.state import app_state
+from flare_ai_rag.utils import SemanticCache, load_json
+from flare_ai_rag.state import app_state, get_qdrant_client
 
 from flare_ai_rag.discord.service import start_bot
 
@@ -49,15 +56,23 @@ def setup_router(input_config: dict) -> tuple[GeminiProvider, GeminiRouter]:
 
 def setup_retriever(
     qdrant_client: QdrantClient,
-    input_config: dict,
-    df_docs: pd.DataFrame,
+    retriever_config: RetrieverConfig,
+    docs_path: Path,
 ) -> QdrantRetriever:
-    """Initialize the Qdrant retriever."""
-    # Set up Qdrant config
-    retriever_config = RetrieverConfig.load(input_config["retriever_config"])
+    """
+    Initialize the Qdrant retriever.
+
+    The CSV is only needed to (re)generate the collection, so it is loaded here
+    and released when this function returns instead of living as long as the app.
+    """
+    # Load RAG data.
+    df_docs = pd.read_csv(docs_path, delimiter=",")
+    logger.info("Loaded CSV Data.", num_rows=len(df_docs))
 
-    # Set up Gemini Embedding client
-    embedding_client = GeminiEmbedding(settings.gemini_api_key)
+    # Set up Gemini Embedding client, cached on disk across restarts
+    embedding_client = CachedGeminiEmbedding(
+        settings.gemini_api_key, cache_path=settings.embedding_cache_path
+    )
     # (Re)generate qdrant collection
     generate_collection(
         df_docs,
@@ -68,6 +83,7 @@ def setup_retriever(
     logger.info(
         "The Qdrant collection has been generated.",
         collection_name=retriever_config.collection_name,
+        embedding_cache=embedding_client.stats(),
     )
 
     retriever = QdrantRetriever(
@@ -82,11 +98,11 @@ def setup_retriever(
 
     return retriever
 
-def setup_qdrant(input_config: dict) -> QdrantClient:
+def setup_qdrant(retriever_config: RetrieverConfig) -> QdrantClient:
     """Initialize Qdrant client."""
     logger.info("Setting up Qdrant client...")
-    retriever_config = RetrieverConfig.load(input_config["retriever_config"])
-    qdrant_client = QdrantClient(host=retriever_config.host, port=retriever_config.port)
+    # Talk to Qdrant over gRPC, which sends vectors as protobuf instead of JSON.
+    qdrant_client = get_qdrant_client(retriever_config)
     logger.info("Qdrant client has been set up.")
 
     return qdrant_client
@@ -135,23 +151,38 @@ def create_app() -> FastAPI:
 
     # Load input configuration.
     input_config = load_json(settings.input_path / "input_parameters.json")
-
-    # Load RAG data.
-    df_docs = pd.read_csv(settings.data_path / "docs.csv", delimiter=",")
-    logger.info("Loaded CSV Data.", num_rows=len(df_docs))
+    retriever_config = RetrieverConfig.load(input_config["retriever_config"])
 
     # Set up the RAG components: 1. Gemini Provider
     base_ai, router_component = setup_router(input_config)
 
     # 2a. Set up Qdrant client.
-    qdrant_client = setup_qdrant(input_config)
+    qdrant_client = setup_qdrant(retriever_config)
 
     # 2b. Set up the Retriever.
-    retriever_component = setup_retriever(qdrant_client, input_config, df_docs)
+    retriever_component = setup_retriever(
+        qdrant_client, retriever_config, settings.data_path / "docs.csv"
+    )
 
     # 3. Set up the Responder.
     responder_component = setup_responder(input_config)
 
+    # 4. Optionally classify confident queries from their embedding alone.
+    router_gate = None
+    if settings.router_gate_enabled:
+        router_gate = EmbeddingRouterGate.from_descriptions(
+            retriever_component.embedding_client,
+            retriever_config.embedding_model,
+            ROUTER_LABEL_DESCRIPTIONS,
+            min_similarity=settings.router_gate_min_similarity,
+            min_margin=settings.router_gate_min_margin,
+        )
+
+    # Answers expire after a while and are dropped when the collection changes.
+    app_state.semantic_cache = SemanticCache(
+        dim=retriever_config.vector_size, ttl=settings.semantic_cache_ttl_seconds
+    )
+
     # Create an APIRouter for chat endpoints and initialize ChatRouter.
     chat_router = ChatRouter(
         router=APIRouter(),
@@ -161,6 +192,11 @@ def create_app() -> FastAPI:
         responder=responder_component,
         attestation=Vtpm(simulate=settings.simulate_attestation),
         prompts=PromptService(),
+        semantic_cache=app_state.semantic_cache,
+        classification_cache=SemanticCache(
+            dim=retriever_config.vector_size, ttl=settings.semantic_cache_ttl_seconds
+        ),
+        router_gate=router_gate,
     )
     app.include_router(chat_router.router, prefix="/api/routes/chat", tags=["chat"])
 
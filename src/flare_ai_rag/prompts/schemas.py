@@ -9,7 +9,7 @@ interactions, ensuring consistency in prompt formatting and response handling
 across the application.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from string import Template
 from typing import TypedDict
@@ -112,14 +112,21 @@ class Prompt:
     examples: list[dict[str, str]] | None = None
     category: str | None = None
     version: str = "1.0"
+    _format_string: str = field(init=False, repr=False, compare=False)
+    _placeholders: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Precompile the template into a str.format_map format string."""
+        self._format_string, self._placeholders = _compile_template(self.template)
 
     def format(self, **kwargs: str | PromptInputs) -> str:
         """
         Format the prompt template with provided input values.
 
-        This method uses string.Template to substitute variables in the prompt
-        template with provided values. It validates that all required inputs
-        are provided before formatting.
+        The string.Template placeholders are compiled once into a str.format_map
+        format string. When inputs are missing, Template.safe_substitute is used,
+        so unknown placeholders are left untouched. It validates that all
+        required inputs are provided before formatting.
 
         Args:
             **kwargs: Keyword arguments containing values for template variables.
@@ -145,11 +152,38 @@ class Prompt:
         if not self.required_inputs:
             return self.template
 
-        try:
-            return Template(self.template).safe_substitute(**kwargs)
-        except KeyError as e:
-            missing_keys = set(self.required_inputs) - set(kwargs.keys())
-            if missing_keys:
-                msg = f"Missing required inputs: {missing_keys}"
-                raise ValueError(msg) from e
-            raise
+        if self._placeholders <= kwargs.keys():
+            return self._format_string.format_map(kwargs)
+        # Leave missing placeholders exactly as they are spelled in the template.
+        return Template(self.template).safe_substitute(kwargs)
+
+
+def _compile_template(template: str) -> tuple[str, frozenset[str]]:
+    """
+    Convert a string.Template source into an equivalent str.format string.
+
+    Literal braces are escaped, "$$" becomes "$" and every "$name" or
+    "${name}" placeholder becomes "{name}". The format string only matches
+    Template.safe_substitute when every placeholder is given, so the
+    placeholder names are returned alongside it.
+    """
+    parts: list[str] = []
+    names: set[str] = set()
+    last = 0
+    for match in Template.pattern.finditer(template):
+        parts.append(_escape_braces(template[last : match.start()]))
+        name = match.group("named") or match.group("braced")
+        if name is not None:
+            parts.append(f"{{{name}}}")
+            names.add(name)
+        elif match.group("escaped") is not None:
+            parts.append("$")
+        else:
+            parts.append(_escape_braces(match.group()))
+        last = match.end()
+    parts.append(_escape_braces(template[last:]))
+    return "".join(parts), frozenset(names)
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 
@@ -7,3 +8,16 @@ class BaseResponder(ABC):
         """
         Generate a final answer given the query and a list of retrieved documents.
         """
+
+    async def agenerate_response(
+        self, query: str, retrieved_documents: list[dict]
+    ) -> str:
+        """
+        Asynchronous variant of `generate_response`.
+
+        Runs the blocking `generate_response` in a worker thread unless a
+        subclass provides a native asynchronous implementation.
+        """
+        return await asyncio.to_thread(
+            self.generate_response, query, retrieved_documents
+        )
@@ -16,6 +16,9 @@ explicitly supported by the context.
 Generate an answer to the user query based solely on the given context.
 """
 
+# Appended after the retrieved-documents context and the user query. Keep the
+# context first and the per-request query last: an unchanged prefix lets the
+# provider's prompt (KV) cache be reused across queries hitting the same docs.
 RESPONDER_PROMPT = (
     """Generate an answer to the user query based solely on the given context."""
 )
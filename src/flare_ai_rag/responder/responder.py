@@ -1,3 +1,4 @@
+import functools
 from typing import Any, override
 
 from flare_ai_rag.ai import GeminiProvider, OpenRouterClient
@@ -5,6 +6,33 @@ from flare_ai_rag.responder import BaseResponder, ResponderConfig
 from flare_ai_rag.utils import parse_chat_response
 
 
+@functools.lru_cache(maxsize=1024)
+def _format_context(documents: tuple[tuple[str, str], ...]) -> str:
+    """
+    Build the context block for a set of (identifier, text) documents.
+
+    Cached because the same documents are retrieved for many queries. The text
+    is part of the key since filenames are not unique within the corpus.
+    """
+    parts = ["List of retrieved documents:\n"]
+    parts.extend(
+        f"Document {identifier}:\n{text}\n\n" for identifier, text in documents
+    )
+    return "".join(parts)
+
+
+def _build_context(retrieved_documents: list[dict]) -> str:
+    """Return the context block for retrieved documents, in retrieval order."""
+    documents = tuple(
+        (
+            str(doc.get("metadata", {}).get("filename", f"Doc{idx}")),
+            str(doc.get("text", "")),
+        )
+        for idx, doc in enumerate(retrieved_documents, start=1)
+    )
+    return _format_context(documents)
+
+
 class GeminiResponder(BaseResponder):
     def __init__(
         self, client: GeminiProvider, responder_config: ResponderConfig
@@ -27,25 +55,47 @@ class GeminiResponder(BaseResponder):
         :param retrieved_documents: A list of dictionaries containing retrieved docs.
         :return: The generated answer as a string.
         """
-        context = "List of retrieved documents:\n"
+        # Use the generate method of GeminiProvider to obtain a response.
+        response = self.client.generate(
+            self._build_prompt(query, retrieved_documents),
+            response_mime_type=None,
+            response_schema=None,
+        )
 
-        # Build context from the retrieved documents.
-        for idx, doc in enumerate(retrieved_documents, start=1):
-            identifier = doc.get("metadata", {}).get("filename", f"Doc{idx}")
-            context += f"Document {identifier}:\n{doc.get('text', '')}\n\n"
+        return response.text
 
-        # Compose the prompt
-        prompt = context + f"User query: {query}\n" + self.responder_config.query_prompt
+    @override
+    async def agenerate_response(
+        self, query: str, retrieved_documents: list[dict]
+    ) -> str:
+        """
+        Generate a final answer asynchronously using the query and the retrieved
+        context.
 
-        # Use the generate method of GeminiProvider to obtain a response.
-        response = self.client.generate(
-            prompt,
+        :param query: The input query.
+        :param retrieved_documents: A list of dictionaries containing retrieved docs.
+        :return: The generated answer as a string.
+        """
+        response = await self.client.agenerate(
+            self._build_prompt(query, retrieved_documents),
             response_mime_type=None,
             response_schema=None,
         )
 
         return response.text
 
+    def _build_prompt(self, query: str, retrieved_documents: list[dict]) -> str:
+        """
+        Compose the responder prompt from the query and retrieved documents.
+
+        The context block comes first and is identical for identical document
+        sets, so the provider can reuse its prefix cache across queries.
+        """
+        context = _build_context(retrieved_documents)
+
+        # Compose the prompt
+        return context + f"User query: {query}\n" + self.responder_config.query_prompt
+
 
 class OpenRouterResponder(BaseResponder):
     def __init__(
@@ -70,12 +120,8 @@ class OpenRouterResponder(BaseResponder):
         :param retrieved_documents: A list of dictionaries containing retrieved docs.
         :return: The generated answer as a string.
         """
-        context = "List of retrieved documents:\n"
-
         # Build context from the retrieved documents.
-        for idx, doc in enumerate(retrieved_documents, start=1):
-            identifier = doc.get("metadata", {}).get("filename", f"Doc{idx}")
-            context += f"Document {identifier}:\n{doc.get('text', '')}\n\n"
+        context = _build_context(retrieved_documents)
 
         # Compose the prompt
         prompt = context + f"User query: {query}\n" + self.responder_config.query_prompt
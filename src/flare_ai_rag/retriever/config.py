@@ -1,3 +1,4 @@
+import sys
 from dataclasses import dataclass
 from typing import Any
 
@@ -11,13 +12,15 @@ class RetrieverConfig:
     vector_size: int
     host: str
     port: int
+    grpc_port: int
 
     @staticmethod
     def load(retriever_config: dict[str, Any]) -> "RetrieverConfig":
         return RetrieverConfig(
-            embedding_model=retriever_config["embedding_model"],
+            embedding_model=sys.intern(retriever_config["embedding_model"]),
             collection_name=retriever_config["collection_name"],
             vector_size=retriever_config["vector_size"],
             host=retriever_config["host"],
             port=retriever_config["port"],
+            grpc_port=retriever_config.get("grpc_port", 6334),
         )
@@ -1,28 +1,168 @@
+import asyncio
+import hashlib
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, cast
+
 import google.api_core.exceptions
+import numpy as np
 import pandas as pd
 import structlog
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, PointStruct, VectorParams
+from qdrant_client.http.models import (
+    Datatype,
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PointStruct,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
 
 from flare_ai_rag.ai import EmbeddingTaskType, GeminiEmbedding
 from flare_ai_rag.retriever.config import RetrieverConfig
-import asyncio
 
 logger = structlog.get_logger(__name__)
 
+# Number of batched embedding requests kept in flight while indexing.
+EMBEDDING_MAX_IN_FLIGHT = 4
+# Number of points sent per upsert request while indexing.
+UPSERT_BATCH_SIZE = 512
+
 
 def _create_collection(
     client: QdrantClient, collection_name: str, vector_size: int
 ) -> None:
     """
     Creates a Qdrant collection with the given parameters.
+
+    Any existing collection of that name is dropped first; callers only get
+    here once `_collection_is_current` has ruled out reusing it.
+    Original vectors are stored as float16 on disk, while an int8 scalar
+    quantized copy is kept in RAM for search.
     :param collection_name: Name of the collection.
     :param vector_size: Dimension of the vectors.
     """
-    client.recreate_collection(
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    client.create_collection(
         collection_name=collection_name,
-        vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+        vectors_config=VectorParams(
+            size=vector_size,
+            distance=Distance.COSINE,
+            datatype=Datatype.FLOAT16,
+            on_disk=True,
+        ),
+        quantization_config=ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class _Document:
+    """A CSV row with valid content, ready to be embedded."""
+
+    id: int
+    content: str
+    file_name: str
+    meta_data: Any
+
+
+def _corpus_sha(documents: list[_Document], retriever_config: RetrieverConfig) -> str:
+    """
+    Fingerprint the documents together with the settings that shape their vectors.
+
+    :param documents: Documents that would be indexed.
+    :param retriever_config: Retriever configuration used for embedding.
+    :return: Hex SHA-256 digest identifying this exact corpus.
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        f"{retriever_config.embedding_model}\0{retriever_config.vector_size}".encode()
     )
+    for document in documents:
+        digest.update(
+            f"\0{document.id}\0{document.file_name}\0{document.meta_data}\0".encode()
+        )
+        digest.update(document.content.encode())
+    return digest.hexdigest()
+
+
+def _collection_is_current(
+    client: QdrantClient, collection_name: str, corpus_sha: str, num_documents: int
+) -> bool:
+    """
+    Check whether the collection already holds every document of this corpus.
+
+    :param collection_name: Name of the collection.
+    :param corpus_sha: Fingerprint stored on every indexed point.
+    :param num_documents: Number of documents the corpus should contain.
+    """
+    if not client.collection_exists(collection_name):
+        return False
+    indexed = client.count(
+        collection_name=collection_name,
+        count_filter=Filter(
+            must=[FieldCondition(key="corpus_sha", match=MatchValue(value=corpus_sha))]
+        ),
+        exact=True,
+    ).count
+    return indexed == num_documents
+
+
+def _embed_document(
+    document: _Document,
+    retriever_config: RetrieverConfig,
+    embedding_client: GeminiEmbedding,
+) -> np.ndarray | None:
+    """
+    Embed a single document, returning None if it has to be skipped.
+
+    Throttled requests are retried with backoff. Expected API failures are
+    logged without a traceback; anything else propagates.
+    """
+    try:
+        return embedding_client.embed_contents_with_retry(
+            embedding_model=retriever_config.embedding_model,
+            task_type=EmbeddingTaskType.RETRIEVAL_DOCUMENT,
+            contents=[document.content],
+            title=document.file_name,
+        )[0]
+    except google.api_core.exceptions.InvalidArgument as e:
+        if "400 Request payload size exceeds the limit" in str(e):
+            logger.warning(
+                "Skipping document due to size limit.",
+                filename=document.file_name,
+            )
+            return None
+        logger.warning(
+            "Error encoding document (InvalidArgument).",
+            filename=document.file_name,
+            error=str(e),
+        )
+        return None
+    except (google.api_core.exceptions.GoogleAPIError, ValueError) as e:
+        logger.warning(
+            "Error encoding document.",
+            filename=document.file_name,
+            error=str(e),
+        )
+        return None
+
+
+def _payload(document: _Document, corpus_sha: str) -> dict[str, Any]:
+    """Build the Qdrant payload for an embedded document."""
+    return {
+        "filename": document.file_name,
+        "metadata": document.meta_data,
+        "text": document.content,
+        "corpus_sha": corpus_sha,
+    }
 
 
 def generate_collection(
@@ -31,7 +171,47 @@ def generate_collection(
     retriever_config: RetrieverConfig,
     embedding_client: GeminiEmbedding,
 ) -> None:
-    """Routine for generating a Qdrant collection for a specific CSV file type."""
+    """
+    Routine for generating a Qdrant collection for a specific CSV file type.
+
+    Every point carries the corpus fingerprint, so a collection that already
+    holds the same documents, embedding model and vector size is reused as is
+    instead of being re-embedded on every restart.
+    """
+    valid = df_docs["content"].map(type).eq(str).to_numpy()
+    if not valid.all():
+        logger.warning(
+            "Skipping documents due to missing or invalid content.",
+            count=int((~valid).sum()),
+            filenames=df_docs["file_name"].to_numpy()[~valid].tolist(),
+        )
+
+    # Point ids are the 1-based CSV row numbers, kept stable across filtering.
+    ids = np.flatnonzero(valid) + 1
+    rows = df_docs.loc[valid, ["file_name", "meta_data", "content"]].itertuples(
+        index=False, name=None
+    )
+    documents = [
+        _Document(
+            id=int(idx),
+            content=content,
+            file_name=str(file_name),
+            meta_data=meta_data,
+        )
+        for idx, (file_name, meta_data, content) in zip(ids, rows, strict=True)
+    ]
+
+    corpus_sha = _corpus_sha(documents, retriever_config)
+    if _collection_is_current(
+        qdrant_client, retriever_config.collection_name, corpus_sha, len(documents)
+    ):
+        logger.info(
+            "Collection is up to date, skipping embedding.",
+            collection_name=retriever_config.collection_name,
+            corpus_sha=corpus_sha,
+        )
+        return
+
     _create_collection(
         qdrant_client, retriever_config.collection_name, retriever_config.vector_size
     )
@@ -39,131 +219,173 @@ def generate_collection(
         "Created the collection.", collection_name=retriever_config.collection_name
     )
 
-    points = []
-    for idx, (_, row) in enumerate(
-        df_docs.iterrows(), start=1
-    ):
-        content = row["content"]
+    # Embed all documents with batched, concurrent requests, each titled with
+    # its file name. Batches that fail are retried document by document with
+    # the per-document error handling.
+    embeddings: list[np.ndarray | None] = asyncio.run(
+        embedding_client.embed_batch_concurrent(
+            embedding_model=retriever_config.embedding_model,
+            texts=[document.content for document in documents],
+            task_type=EmbeddingTaskType.RETRIEVAL_DOCUMENT,
+            max_in_flight=EMBEDDING_MAX_IN_FLIGHT,
+            titles=[document.file_name for document in documents],
+        )
+    )
 
-        if not isinstance(content, str):
-            logger.warning(
-                "Skipping document due to missing or invalid content.",
-                filename=row["file_name"],
-            )
-            continue
-
-        try:
-            embedding = embedding_client.embed_content(
-                embedding_model=retriever_config.embedding_model,
-                task_type=EmbeddingTaskType.RETRIEVAL_DOCUMENT,
-                contents=content,
-                title=str(row["file_name"]),
-            )
-        except google.api_core.exceptions.InvalidArgument as e:
-            if "400 Request payload size exceeds the limit" in str(e):
-                logger.warning(
-                    "Skipping document due to size limit.",
-                    filename=row["file_name"],
-                )
-                continue
-            logger.exception(
-                "Error encoding document (InvalidArgument).",
-                filename=row["file_name"],
+    missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=EMBEDDING_MAX_IN_FLIGHT) as pool:
+            retried = pool.map(
+                lambda idx: _embed_document(
+                    documents[idx], retriever_config, embedding_client
+                ),
+                missing,
             )
-            continue
-        except Exception:
-            logger.exception(
-                "Error encoding document (general).",
-                filename=row["file_name"],
-            )
-            continue
-
-        payload = {
-            "filename": row["file_name"],
-            "metadata": row["meta_data"],
-            "text": content,
-        }
-
-        point = PointStruct(
-            id=idx,  
-            vector=embedding,
-            payload=payload,
-        )
-        points.append(point)
+            for idx, embedding in zip(missing, retried, strict=True):
+                embeddings[idx] = embedding
 
-    if points:
-        qdrant_client.upsert(
+    embedded = [
+        (document, embedding)
+        for document, embedding in zip(documents, embeddings, strict=True)
+        if embedding is not None
+    ]
+    if embedded:
+        # Let the client split the upload into batches. Every batch waits for
+        # indexing, so the collection is complete once this returns. The upload
+        # stays in-process: parallel > 1 starts a forkserver pool that
+        # re-imports __main__, i.e. flare_ai_rag.main, which rebuilds the app.
+        qdrant_client.upload_collection(
             collection_name=retriever_config.collection_name,
-            points=points,
+            vectors=np.stack([embedding for _, embedding in embedded]),
+            payload=[_payload(document, corpus_sha) for document, _ in embedded],
+            ids=[document.id for document, _ in embedded],
+            batch_size=UPSERT_BATCH_SIZE,
+            parallel=1,
+            wait=True,
         )
         logger.info(
             "Collection generated and documents inserted into Qdrant successfully.",
             collection_name=retriever_config.collection_name,
-            num_points=len(points),
+            num_points=len(embedded),
         )
     else:
         logger.warning("No valid documents found to insert.")
 
 
-async def store_discord_message(
-    message_content: str,
-    author_id: str,
-    jump_url: str,
+@dataclass(frozen=True)
+class DiscordMessage:
+    """A Discord message waiting to be stored in the vector database."""
+
+    content: str
+    author_id: str
+    jump_url: str
+    timestamp: pd.Timestamp = field(default_factory=pd.Timestamp.now)
+
+
+def _discord_point(message: DiscordMessage, embedding: np.ndarray) -> PointStruct:
+    """Build the Qdrant point for an embedded Discord message."""
+    return PointStruct(
+        id=str(uuid.uuid5(uuid.NAMESPACE_URL, message.jump_url)),
+        vector=cast(list[float], embedding.tolist()),
+        payload={
+            "filename": message.jump_url,
+            "text": message.content,
+            "author_id": message.author_id,
+            "type": "discord_message",
+            "timestamp": message.timestamp.isoformat(),
+        },
+    )
+
+
+async def store_discord_messages(
+    messages: list[DiscordMessage],
     qdrant_client: QdrantClient,
     retriever_config: RetrieverConfig,
     embedding_client: GeminiEmbedding,
 ) -> None:
     """
-    Store a Discord message in the vector database.
-    
+    Store a batch of Discord messages in the vector database.
+
+    All messages are embedded in one request and written with one upsert.
+    Point ids are derived from each message's jump URL, so storing needs no
+    extra round-trip to Qdrant, concurrent stores cannot collide and storing
+    the same message again overwrites its point instead of duplicating it.
+    Embedding and upserting don't block the event loop, so the bot keeps
+    handling other messages meanwhile.
+
     Args:
-        message_content: The content of the message to store
-        author_id: The Discord ID of the message author
+        messages: The messages to store
         qdrant_client: The Qdrant client instance
         retriever_config: Configuration for the retriever
         embedding_client: The embedding client instance
+
+    Raises:
+        Exception: Any embedding or upsert failure, after it has been logged
     """
+    if not messages:
+        return
+    author_ids = sorted({message.author_id for message in messages})
     try:
-        collection_info = qdrant_client.get_collection(retriever_config.collection_name)
-        next_id = collection_info.points_count + 1
-
-        timestamp = pd.Timestamp.now()
-        
-        doc_name = f"discord_msg_{author_id}_{timestamp.strftime('%Y%m%d_%H%M%S')}"
-
-        embedding = embedding_client.embed_content(
+        # google-generativeai shares one async client per process, bound to the
+        # first event loop that uses it. The API runs on another loop, so use
+        # the blocking client off this one instead.
+        embeddings = await asyncio.to_thread(
+            embedding_client.embed_contents,
             embedding_model=retriever_config.embedding_model,
             task_type=EmbeddingTaskType.RETRIEVAL_DOCUMENT,
-            contents=message_content,
+            contents=[message.content for message in messages],
         )
 
-        payload = {
-            "filename": jump_url,
-            "text": message_content,
-            "author_id": author_id,
-            "type": "discord_message",
-            "timestamp": timestamp.isoformat(),
-        }
-
-        point = PointStruct(
-            id=next_id,
-            vector=embedding,
-            payload=payload,
-        )
-
-        qdrant_client.upsert(
+        # The shared client is synchronous, so upsert off the event loop.
+        await asyncio.to_thread(
+            qdrant_client.upsert,
             collection_name=retriever_config.collection_name,
-            points=[point],
+            points=[
+                _discord_point(message, embedding)
+                for message, embedding in zip(messages, embeddings, strict=True)
+            ],
         )
-        
+
         logger.info(
-            "Successfully stored Discord message in vector database",
-            author_id=author_id,
-            doc_name=doc_name,
+            "Successfully stored Discord messages in vector database",
+            author_ids=author_ids,
+            num_messages=len(messages),
         )
     except Exception as e:
         logger.exception(
-            "Failed to store Discord message",
-            author_id=author_id,
+            "Failed to store Discord messages",
+            author_ids=author_ids,
             error=str(e),
         )
+        raise
+
+
+async def store_discord_message(
+    message_content: str,
+    author_id: str,
+    jump_url: str,
+    qdrant_client: QdrantClient,
+    retriever_config: RetrieverConfig,
+    embedding_client: GeminiEmbedding,
+) -> None:
+    """
+    Store a single Discord message in the vector database.
+
+    Args:
+        message_content: The content of the message to store
+        author_id: The Discord ID of the message author
+        jump_url: The Discord URL of the message
+        qdrant_client: The Qdrant client instance
+        retriever_config: Configuration for the retriever
+        embedding_client: The embedding client instance
+    """
+    await store_discord_messages(
+        [
+            DiscordMessage(
+                content=message_content, author_id=author_id, jump_url=jump_url
+            )
+        ],
+        qdrant_client,
+        retriever_config,
+        embedding_client,
+    )
@@ -1,11 +1,18 @@
+import threading
+from collections import OrderedDict
 from typing import override
 
+import numpy as np
 from qdrant_client import QdrantClient
+from qdrant_client.http.models import PayloadSelectorExclude
 
 from flare_ai_rag.ai import EmbeddingTaskType, GeminiEmbedding
 from flare_ai_rag.retriever.base import BaseRetriever
 from flare_ai_rag.retriever.config import RetrieverConfig
 
+# Number of query embeddings kept in memory by each retriever.
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
 
 class QdrantRetriever(BaseRetriever):
     def __init__(
@@ -13,11 +20,76 @@ class QdrantRetriever(BaseRetriever):
         client: QdrantClient,
         retriever_config: RetrieverConfig,
         embedding_client: GeminiEmbedding,
+        query_cache_size: int = QUERY_EMBEDDING_CACHE_SIZE,
     ) -> None:
         """Initialize the QdrantRetriever."""
         self.client = client
         self.retriever_config = retriever_config
         self.embedding_client = embedding_client
+        self.query_cache_size = query_cache_size
+        self._query_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Convert a query into a vector embedding using Gemini.
+
+        Repeated queries are served from an in-memory LRU cache.
+
+        :param query: The input query.
+        :return: The float32 query embedding (read-only).
+        """
+        cached = self._cached_query(query)
+        if cached is not None:
+            return cached
+        return self._cache_query(
+            query,
+            self.embedding_client.embed_content(
+                embedding_model=self.retriever_config.embedding_model,
+                contents=query,
+                task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
+            ),
+        )
+
+    async def aembed_query(self, query: str) -> np.ndarray:
+        """
+        Convert a query into a vector embedding without blocking the event loop.
+
+        Repeated queries are served from an in-memory LRU cache.
+
+        :param query: The input query.
+        :return: The float32 query embedding (read-only).
+        """
+        cached = self._cached_query(query)
+        if cached is not None:
+            return cached
+        return self._cache_query(
+            query,
+            await self.embedding_client.aembed_content(
+                embedding_model=self.retriever_config.embedding_model,
+                contents=query,
+                task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
+            ),
+        )
+
+    def _cached_query(self, query: str) -> np.ndarray | None:
+        """Return the cached embedding of a query, marking it recently used."""
+        with self._query_cache_lock:
+            embedding = self._query_cache.get(query)
+            if embedding is not None:
+                self._query_cache.move_to_end(query)
+            return embedding
+
+    def _cache_query(self, query: str, embedding: np.ndarray) -> np.ndarray:
+        """Cache a query embedding, evicting the least recently used one."""
+        # Callers share the cached array, so make sure none of them mutates it.
+        embedding.flags.writeable = False
+        with self._query_cache_lock:
+            self._query_cache[query] = embedding
+            self._query_cache.move_to_end(query)
+            if len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+        return embedding
 
     @override
     def semantic_search(self, query: str, top_k: int = 5) -> list[dict]:
@@ -30,31 +102,33 @@ class QdrantRetriever(BaseRetriever):
         :return: A list of dictionaries, each representing a retrieved document.
         """
         # Convert the query into a vector embedding using Gemini
-        query_vector = self.embedding_client.embed_content(
-            embedding_model="models/text-embedding-004",
-            contents=query,
-            task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
-        )
+        query_vector = self.embed_query(query)
+        return self.search_by_vector(query_vector, top_k=top_k)
 
-        # Search Qdrant for similar vectors.
-        results = self.client.search(
+    def search_by_vector(self, query_vector: np.ndarray, top_k: int = 5) -> list[dict]:
+        """
+        Search Qdrant with an already computed query embedding.
+
+        :param query_vector: The query embedding, e.g. from `aembed_query`.
+        :param top_k: Number of top results to return.
+        :return: A list of dictionaries, each representing a retrieved document.
+        """
+        # Search Qdrant for similar vectors. The corpus fingerprint is only
+        # used to detect stale collections, so it is not sent back.
+        results = self.client.query_points(
             collection_name=self.retriever_config.collection_name,
-            query_vector=query_vector,
+            query=query_vector,
             limit=top_k,
+            with_payload=PayloadSelectorExclude(exclude=["corpus_sha"]),
         )
 
-        # Process and return results.
-        output = []
-        for hit in results:
-            if hit.payload:
-                text = hit.payload.get("text", "")
-                metadata = {
-                    field: value
-                    for field, value in hit.payload.items()
-                    if field != "text"
-                }
-            else:
-                text = ""
-                metadata = ""
-            output.append({"text": text, "score": hit.score, "metadata": metadata})
-        return output
+        # Each hit owns its payload, so take the text out of it in place and
+        # keep the remaining fields as metadata.
+        return [
+            {
+                "text": (payload := hit.payload or {}).pop("text", ""),
+                "score": hit.score,
+                "metadata": payload,
+            }
+            for hit in results.points
+        ]
@@ -1,12 +1,21 @@
 from .base import BaseQueryRouter
 from .config import RouterConfig
-from .prompts import ROUTER_INSTRUCTION, ROUTER_PROMPT
+from .gate import EmbeddingRouterGate
+from .prompts import (
+    ROUTER_BATCH_PROMPT,
+    ROUTER_INSTRUCTION,
+    ROUTER_LABEL_DESCRIPTIONS,
+    ROUTER_PROMPT,
+)
 from .router import GeminiRouter, QueryRouter
 
 __all__ = [
+    "ROUTER_BATCH_PROMPT",
     "ROUTER_INSTRUCTION",
+    "ROUTER_LABEL_DESCRIPTIONS",
     "ROUTER_PROMPT",
     "BaseQueryRouter",
+    "EmbeddingRouterGate",
     "GeminiRouter",
     "QueryRouter",
     "RouterConfig",
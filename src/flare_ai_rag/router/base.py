@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any
 
@@ -17,3 +18,19 @@ class BaseQueryRouter(ABC):
         """
         Determine the type of the query: ANSWER, CLARIFY, or REJECT.
         """
+
+    async def aroute_query(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> str:
+        """
+        Asynchronous variant of `route_query`.
+
+        Runs the blocking `route_query` in a worker thread unless a subclass
+        provides a native asynchronous implementation.
+        """
+        return await asyncio.to_thread(
+            self.route_query, prompt, response_mime_type, response_schema
+        )
@@ -1,33 +1,61 @@
+import functools
 from dataclasses import dataclass
 from typing import Any
 
 from flare_ai_rag.ai import Model
-from flare_ai_rag.router.prompts import ROUTER_INSTRUCTION, ROUTER_PROMPT
+from flare_ai_rag.router.prompts import (
+    ROUTER_BATCH_PROMPT,
+    ROUTER_INSTRUCTION,
+    ROUTER_PROMPT,
+)
+
+# Cap on the tokens streamed for one classification when the config sets none:
+# room for a pretty-printed {"classification": "<label>"} object. Streaming
+# stops at the label, so only the streaming label path applies it.
+ROUTER_MAX_OUTPUT_TOKENS = 32
 
 
 @dataclass(frozen=True)
 class RouterConfig:
     system_prompt: str
     router_prompt: str
+    batch_prompt: str
     model: Model
     answer_option: str
     clarify_option: str
     reject_option: str
 
+    @functools.cached_property
+    def valid_options(self) -> frozenset[str]:
+        """The classifications a router may return."""
+        return frozenset({self.answer_option, self.clarify_option, self.reject_option})
+
     @staticmethod
     def load(model_config: dict[str, Any]) -> "RouterConfig":
-        """Loads the router config."""
-        model = Model(
-            model_id=model_config["id"],
-            max_tokens=model_config.get("max_tokens"),
-            temperature=model_config.get("temperature"),
-        )
+        """
+        Loads the router config.
 
-        return RouterConfig(
-            system_prompt=ROUTER_INSTRUCTION,
-            router_prompt=ROUTER_PROMPT,
-            model=model,
-            answer_option="ANSWER",
-            clarify_option="CLARIFY",
-            reject_option="REJECT",
+        Configs are cached by the model settings they depend on, so repeated
+        loads share one instance.
+        """
+        return _load(
+            model_config["id"],
+            model_config.get("max_tokens"),
+            model_config.get("temperature"),
         )
+
+
+@functools.cache
+def _load(
+    model_id: str, max_tokens: int | None, temperature: float | None
+) -> RouterConfig:
+    """Build the router config for one set of model settings."""
+    return RouterConfig(
+        system_prompt=ROUTER_INSTRUCTION,
+        router_prompt=ROUTER_PROMPT,
+        batch_prompt=ROUTER_BATCH_PROMPT,
+        model=Model(model_id=model_id, max_tokens=max_tokens, temperature=temperature),
+        answer_option="ANSWER",
+        clarify_option="CLARIFY",
+        reject_option="REJECT",
+    )
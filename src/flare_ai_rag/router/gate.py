@@ -0,0 +1,111 @@
+"""
+Embedding Router Gate Module
+
+This module classifies queries without an LLM call by comparing the query
+embedding to embeddings of the router label descriptions. Only confident
+matches are returned, so ambiguous queries still go to the query router.
+"""
+
+import numpy as np
+import structlog
+
+from flare_ai_rag.ai import EmbeddingTaskType, GeminiEmbedding
+
+logger = structlog.get_logger(__name__)
+
+
+class EmbeddingRouterGate:
+    """
+    Nearest-label classifier over query embeddings.
+
+    A query gets the label whose description embedding is most similar to it,
+    but only when that cosine similarity reaches `min_similarity` and beats
+    the runner-up by at least `min_margin`. Otherwise the gate abstains.
+
+    A hit skips the query router entirely, including its REJECT policy, so the
+    gate is opt-in (`settings.router_gate_enabled`). The default thresholds
+    are starting points, not calibrated values: check them against labelled
+    queries with tests/test_router_gate.py before enabling the gate.
+
+    Attributes:
+        labels (list[str]): Labels, in the row order of the description matrix
+        min_similarity (float): Minimum cosine similarity to the best label
+        min_margin (float): Minimum similarity lead over the second best label
+        hits (int): Number of queries the gate classified
+        misses (int): Number of queries the gate abstained on
+    """
+
+    def __init__(
+        self,
+        label_vectors: dict[str, np.ndarray],
+        min_similarity: float = 0.8,
+        min_margin: float = 0.1,
+    ) -> None:
+        """
+        Initialize the gate.
+
+        Args:
+            label_vectors (dict[str, np.ndarray]): Description embedding per label
+            min_similarity (float): Minimum cosine similarity to the best label
+            min_margin (float): Minimum similarity lead over the second best label
+        """
+        self.labels = list(label_vectors)
+        matrix = np.stack(list(label_vectors.values())).astype(np.float32)
+        self._matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_descriptions(
+        cls,
+        embedding_client: GeminiEmbedding,
+        embedding_model: str,
+        descriptions: dict[str, str],
+        **kwargs: float,
+    ) -> "EmbeddingRouterGate":
+        """
+        Build a gate by embedding one description per label in a single request.
+
+        Descriptions are embedded as retrieval queries, the same task type the
+        retriever uses for the queries the gate will compare against.
+
+        Args:
+            embedding_client (GeminiEmbedding): Client used for the embeddings
+            embedding_model (str): The embedding model to use
+            descriptions (dict[str, str]): Description text per label
+            **kwargs (float): Thresholds forwarded to the constructor
+        """
+        embeddings = embedding_client.embed_contents(
+            embedding_model=embedding_model,
+            contents=list(descriptions.values()),
+            task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
+        )
+        return cls(dict(zip(descriptions, embeddings, strict=True)), **kwargs)
+
+    def classify(self, query_vector: np.ndarray) -> str | None:
+        """
+        Return the label of a query when the match is confident, else None.
+
+        Args:
+            query_vector (np.ndarray): Query embedding from the same model
+
+        Returns:
+            str | None: The label, or None to defer to the query router
+        """
+        norm = float(np.linalg.norm(query_vector))
+        if not norm:
+            self.misses += 1
+            return None
+        scores = self._matrix @ (query_vector / norm)
+        second, best = np.argsort(scores)[-2:]
+        if (
+            scores[best] < self.min_similarity
+            or scores[best] - scores[second] < self.min_margin
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.debug("router_gate_hit", label=self.labels[best], score=scores[best])
+        return self.labels[best]
@@ -12,3 +12,19 @@ Do not include any additional text or empty lines. The JSON should look like thi
 """
 
 ROUTER_PROMPT = """Classify the following query:\n"""
+
+ROUTER_BATCH_PROMPT = """Classify each of the following numbered queries independently, using the same options. Instead of a single object, return a JSON object with a single key "classifications" whose value is a list holding exactly one option per query, in the same order as the queries. Do not include any additional text. The JSON should look like this:
+
+{
+    "classifications": [<option for query 1>, <option for query 2>, ...]
+}
+
+Queries:
+"""
+
+# Label descriptions embedded by EmbeddingRouterGate to classify queries locally.
+ROUTER_LABEL_DESCRIPTIONS = {
+    "ANSWER": "A clear, specific factual question about the Flare Network blockchain, its protocols such as FTSO or FDC, its tokens, staking or its developer tooling.",
+    "CLARIFY": "An ambiguous or vague message that needs more context before it can be answered.",
+    "REJECT": "A question unrelated to the Flare Network and to blockchains, such as general knowledge, geography, cooking or entertainment.",
+}
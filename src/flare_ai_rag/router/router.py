@@ -1,10 +1,17 @@
+import asyncio
+import contextlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
 from typing import Any, override
 
 import structlog
 
 from flare_ai_rag.ai import GeminiProvider, OpenRouterClient
+from flare_ai_rag.ai.base import ModelResponse
 from flare_ai_rag.router import BaseQueryRouter
-from flare_ai_rag.router.config import RouterConfig
+from flare_ai_rag.router.config import ROUTER_MAX_OUTPUT_TOKENS, RouterConfig
 from flare_ai_rag.utils import (
     parse_chat_response_as_json,
     parse_gemini_response_as_json,
@@ -12,6 +19,118 @@ from flare_ai_rag.utils import (
 
 logger = structlog.get_logger(__name__)
 
+# Largest number of queries classified together in one batched request.
+ROUTER_MAX_BATCH_QUERIES = 8
+# Largest number of batched requests in flight at once for one query set.
+ROUTER_MAX_CONCURRENT_BATCHES = 4
+
+# Number of exact prompt -> classification results each router remembers.
+CLASSIFICATION_MEMO_SIZE = 4096
+
+_MemoKey = tuple[str, str, str, str | None, str]
+
+
+class _ClassificationMemo:
+    """Thread-safe LRU map from an exact routing request to its classification."""
+
+    def __init__(self, maxsize: int = CLASSIFICATION_MEMO_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[_MemoKey, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        config: RouterConfig,
+        prompt: str,
+        response_mime_type: str | None,
+        response_schema: Any | None,
+    ) -> _MemoKey:
+        """Build the key identifying everything that shapes the classification."""
+        return (
+            config.model.model_id,
+            config.system_prompt,
+            prompt,
+            response_mime_type,
+            repr(response_schema),
+        )
+
+    def get(self, key: _MemoKey) -> str | None:
+        with self._lock:
+            classification = self._entries.get(key)
+            if classification is not None:
+                self._entries.move_to_end(key)
+            return classification
+
+    def put(self, key: _MemoKey, classification: str) -> None:
+        with self._lock:
+            self._entries[key] = classification
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def _format_batch(config: RouterConfig, queries: list[str]) -> str:
+    """Build the prompt asking for one classification per query."""
+    numbered = "\n".join(
+        f"{idx}. {query}" for idx, query in enumerate(queries, start=1)
+    )
+    return f"{config.batch_prompt}{numbered}"
+
+
+def _batch_max_tokens(config: RouterConfig, num_queries: int) -> int | None:
+    """Scale the per-classification output cap to a batch of queries."""
+    if config.model.max_tokens is None:
+        return None
+    return config.model.max_tokens * num_queries
+
+
+def _parse_batch(
+    config: RouterConfig, parse: Callable[[], Any], expected: int
+) -> list[str] | None:
+    """
+    Parse and validate a batched classification response.
+
+    Unknown labels become the clarify option. Returns None when the response
+    is not JSON or does not hold exactly one label per query.
+    """
+    try:
+        response = parse()
+    except ValueError:
+        return None
+    labels = response.get("classifications") if isinstance(response, dict) else None
+    if not isinstance(labels, list) or len(labels) != expected:
+        return None
+    return [
+        label.upper()
+        if isinstance(label, str) and label.upper() in config.valid_options
+        else config.clarify_option
+        for label in labels
+    ]
+
+
+async def _route_in_batches(
+    router: "GeminiRouter | QueryRouter", queries: list[str]
+) -> list[str]:
+    """
+    Classify a large query set as concurrent batched requests.
+
+    At most ROUTER_MAX_CONCURRENT_BATCHES requests are in flight, so a large
+    set does not trip the provider's rate limit all at once.
+    """
+    semaphore = asyncio.Semaphore(ROUTER_MAX_CONCURRENT_BATCHES)
+
+    async def route_batch(batch: list[str]) -> list[str]:
+        async with semaphore:
+            return await router.aroute_queries(batch)
+
+    batches = await asyncio.gather(
+        *(
+            route_batch(queries[start : start + ROUTER_MAX_BATCH_QUERIES])
+            for start in range(0, len(queries), ROUTER_MAX_BATCH_QUERIES)
+        )
+    )
+    return [classification for batch in batches for classification in batch]
+
 
 class GeminiRouter(BaseQueryRouter):
     """
@@ -25,6 +144,16 @@ class GeminiRouter(BaseQueryRouter):
         """
         self.router_config = config
         self.client = client
+        self._memo = _ClassificationMemo()
+        # The streamed label path stops at the label, so it can always be capped.
+        self._stream_max_tokens = config.model.max_tokens or ROUTER_MAX_OUTPUT_TOKENS
+        # Matches the value of the JSON classification field, so labels that
+        # appear elsewhere in the response are ignored.
+        self._label_re = re.compile(
+            r'"classification"\s*:\s*"('
+            + "|".join(re.escape(option) for option in sorted(config.valid_options))
+            + r')"'
+        )
 
     @override
     def route_query(
@@ -35,29 +164,126 @@ class GeminiRouter(BaseQueryRouter):
     ) -> str:
         """
         Analyze the query using the configured prompt and classify it.
+
+        Identical requests are answered from an in-memory memo.
         """
+        key = self._memo.key(
+            self.router_config, prompt, response_mime_type, response_schema
+        )
+        classification = self._memo.get(key)
+        if classification is not None:
+            return classification
+
         logger.debug("Sending prompt...", prompt=prompt)
-        # Use the generate method of GeminiProvider to obtain a response.
-        response = self.client.generate(
+        # Stream the response and stop reading once a label has been decoded.
+        text = ""
+        classification = None
+        stream = self.client.generate_stream(
             prompt=prompt,
             response_mime_type=response_mime_type,
             response_schema=response_schema,
+            max_output_tokens=self._stream_max_tokens,
         )
-        # Parse the response to extract classification.
-        classification = (
-            parse_gemini_response_as_json(response.raw_response)
-            .get("classification", "")
-            .upper()
+        with contextlib.closing(stream):
+            for chunk in stream:
+                text += chunk
+                classification = self._find_label(text)
+                if classification is not None:
+                    break
+        if classification is None:
+            classification = self._parse_classification(text)
+        self._memo.put(key, classification)
+        return classification
+
+    @override
+    async def aroute_query(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> str:
+        """
+        Analyze the query asynchronously using the configured prompt and classify it.
+
+        Identical requests are answered from an in-memory memo.
+        """
+        key = self._memo.key(
+            self.router_config, prompt, response_mime_type, response_schema
         )
+        classification = self._memo.get(key)
+        if classification is not None:
+            return classification
+
+        logger.debug("Sending prompt...", prompt=prompt)
+        # Stream the response and stop reading once a label has been decoded.
+        text = ""
+        classification = None
+        async with contextlib.aclosing(
+            self.client.agenerate_stream(
+                prompt=prompt,
+                response_mime_type=response_mime_type,
+                response_schema=response_schema,
+                max_output_tokens=self._stream_max_tokens,
+            )
+        ) as stream:
+            async for chunk in stream:
+                text += chunk
+                classification = self._find_label(text)
+                if classification is not None:
+                    break
+        if classification is None:
+            classification = self._parse_classification(text)
+        self._memo.put(key, classification)
+        return classification
+
+    async def aroute_queries(self, queries: list[str]) -> list[str]:
+        """
+        Classify several queries, with a single request when there are few.
+
+        Up to ROUTER_MAX_BATCH_QUERIES queries are sent in one prompt that asks
+        for a JSON list of labels, saving a round-trip per query. Larger sets
+        are split into such batches and sent concurrently. A reply without one
+        label per query is retried one query at a time.
+        """
+        if len(queries) > ROUTER_MAX_BATCH_QUERIES:
+            return await _route_in_batches(self, queries)
+        if len(queries) > 1:
+            prompt = _format_batch(self.router_config, queries)
+            logger.debug("Sending batch prompt...", prompt=prompt)
+            response = await self.client.agenerate(
+                prompt=prompt,
+                response_mime_type="application/json",
+                max_output_tokens=_batch_max_tokens(self.router_config, len(queries)),
+            )
+            classifications = _parse_batch(
+                self.router_config,
+                lambda: parse_gemini_response_as_json(response.raw_response),
+                len(queries),
+            )
+            if classifications is not None:
+                return classifications
+            logger.warning("Batch classification was malformed, routing one by one.")
+
+        return list(await asyncio.gather(*map(self.aroute_query, queries)))
+
+    def _find_label(self, text: str) -> str | None:
+        """Return the classification field's label in partial response text."""
+        match = self._label_re.search(text)
+        return match.group(1) if match else None
+
+    def _parse_classification(self, text: str) -> str:
+        """Extract and validate the classification from the full response text."""
+        try:
+            response = parse_gemini_response_as_json(
+                ModelResponse(text=text, raw_response=None, metadata={})
+            )
+        except ValueError:
+            logger.warning("Classification was not valid JSON.", response=text)
+            return self.router_config.clarify_option
+        classification = str(response.get("classification", "")).upper()
         # Validate the classification.
-        valid_options = {
-            self.router_config.answer_option,
-            self.router_config.clarify_option,
-            self.router_config.reject_option,
-        }
-        if classification not in valid_options:
+        if classification not in self.router_config.valid_options:
             classification = self.router_config.clarify_option
-
         return classification
 
 
@@ -76,6 +302,7 @@ class QueryRouter(BaseQueryRouter):
         self.router_config = config
         self.client = client
         self.query = ""
+        self._memo = _ClassificationMemo()
 
     @override
     def route_query(
@@ -87,36 +314,79 @@ class QueryRouter(BaseQueryRouter):
         """
         Analyze the query using the configured prompt and classify it.
 
+        Identical requests are answered from an in-memory memo.
+
         :param query: The user query.
         :return: One of the classification options defined in the config.
 
         """
-        payload: dict[str, Any] = {
-            "model": self.router_config.model.model_id,
-            "messages": [
-                {"role": "system", "content": self.router_config.system_prompt},
-                {"role": "user", "content": prompt},
-            ],
-        }
-
-        if self.router_config.model.max_tokens is not None:
-            payload["max_tokens"] = self.router_config.model.max_tokens
-        if self.router_config.model.temperature is not None:
-            payload["temperature"] = self.router_config.model.temperature
+        key = self._memo.key(
+            self.router_config, prompt, response_mime_type, response_schema
+        )
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
 
         # Get response
-        response = self.client.send_chat_completion(payload)
+        response = self.client.send_chat_completion(self._payload(prompt))
         classification = (
             parse_chat_response_as_json(response).get("classification", "").upper()
         )
 
         # Validate the classification.
-        valid_options = {
-            self.router_config.answer_option,
-            self.router_config.clarify_option,
-            self.router_config.reject_option,
-        }
-        if classification not in valid_options:
+        if classification not in self.router_config.valid_options:
             classification = self.router_config.clarify_option
 
+        self._memo.put(key, classification)
         return classification
+
+    async def aroute_queries(self, queries: list[str]) -> list[str]:
+        """
+        Classify several queries, with a single request when there are few.
+
+        Up to ROUTER_MAX_BATCH_QUERIES queries are sent in one chat completion
+        that asks for a JSON list of labels, saving a round-trip per query.
+        Larger sets are split into such batches and sent concurrently. A reply
+        without one label per query is retried one query at a time.
+        """
+        if len(queries) > ROUTER_MAX_BATCH_QUERIES:
+            return await _route_in_batches(self, queries)
+        if len(queries) > 1:
+            payload = self._payload(
+                _format_batch(self.router_config, queries),
+                max_tokens=_batch_max_tokens(self.router_config, len(queries)),
+            )
+            response = await asyncio.to_thread(
+                self.client.send_chat_completion, payload
+            )
+            classifications = _parse_batch(
+                self.router_config,
+                lambda: parse_chat_response_as_json(response),
+                len(queries),
+            )
+            if classifications is not None:
+                return classifications
+            logger.warning("Batch classification was malformed, routing one by one.")
+
+        return list(await asyncio.gather(*map(self.aroute_query, queries)))
+
+    def _payload(self, prompt: str, max_tokens: int | None = None) -> dict[str, Any]:
+        """
+        Build the chat completion request for a prompt.
+
+        `max_tokens` overrides the configured cap, e.g. for batched prompts.
+        """
+        payload: dict[str, Any] = {
+            "model": self.router_config.model.model_id,
+            "messages": [
+                {"role": "system", "content": self.router_config.system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+        }
+
+        max_tokens = max_tokens or self.router_config.model.max_tokens
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+        if self.router_config.model.temperature is not None:
+            payload["temperature"] = self.router_config.model.temperature
+        return payload
@@ -1,4 +1,10 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
 from pathlib import Path
+from typing import override
 
 import structlog
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,12 +36,26 @@ class Settings(BaseSettings):
     open_router_base_url: str = "https://openrouter.ai/api/v1"
     open_router_api_key: str = ""
 
+    # Minimum level for structlog output; DEBUG also logs full prompts/responses
+    log_level: str = "INFO"
+
     # Restrict backend listener to specific IPs
     cors_origins: list[str] = ["*"]
 
     # Path Settings
     data_path: Path = create_path("data")
     input_path: Path = create_path("flare_ai_rag")
+    # On-disk cache of computed embeddings, reused across restarts
+    embedding_cache_path: Path = create_path("data") / "embedding_cache.sqlite"
+    # Seconds a cached answer or classification is served to near-duplicate queries
+    semantic_cache_ttl_seconds: float = 3600.0
+
+    # Embedding router gate: classify confident queries without the LLM router.
+    # Off by default; calibrate the thresholds with tests/test_router_gate.py
+    # before enabling it, since a gate hit overrides the router's REJECT policy.
+    router_gate_enabled: bool = False
+    router_gate_min_similarity: float = 0.8
+    router_gate_min_margin: float = 0.1
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -43,6 +63,63 @@ class Settings(BaseSettings):
     )
 
 
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that enqueues records untouched.
+
+    The stock handler formats each record before enqueuing it, which would
+    render the event on the calling thread. The listener runs in the same
+    process, so the record can be handed over as is.
+    """
+
+    @override
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(log_level: str) -> None:
+    """
+    Route structlog events through a queue to a background writer thread.
+
+    Logging calls only build the event dict and enqueue it; rendering and the
+    write to stdout happen on a QueueListener thread, so concurrent tasks do
+    not contend on the output stream. Exceptions are formatted on the calling
+    thread, where the traceback is still available.
+    """
+    level = logging.getLevelNamesMapping()[log_level.upper()]
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        structlog.stdlib.ProcessorFormatter(processor=structlog.dev.ConsoleRenderer())
+    )
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    # Flush the queue on shutdown.
+    atexit.register(listener.stop)
+
+    stdlib_logger = logging.getLogger("flare_ai_rag")
+    stdlib_logger.addHandler(_InProcessQueueHandler(log_queue))
+    stdlib_logger.setLevel(level)
+    stdlib_logger.propagate = False
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=False),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        # Drop log calls below the configured level before any event is rendered.
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        logger_factory=lambda *_: stdlib_logger,
+        cache_logger_on_first_use=True,
+    )
+
+
 # Create a global settings instance
 settings = Settings()
+configure_logging(settings.log_level)
 logger.debug("Settings have been initialized.", settings=settings.model_dump())
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from qdrant_client import QdrantClient
 from flare_ai_rag.ai import GeminiEmbedding
 from flare_ai_rag.retriever.config import RetrieverConfig
+from flare_ai_rag.utils import SemanticCache
 
 @dataclass
 class AppState:
@@ -9,6 +10,26 @@ class AppState:
     qdrant_client: QdrantClient | None = None
     retriever_config: RetrieverConfig | None = None
     embedding_client: GeminiEmbedding | None = None
+    # Answers cached by the chat API; cleared whenever the collection changes.
+    semantic_cache: SemanticCache | None = None
 
 # Global state instance
-app_state = AppState() 
\ No newline at end of file
+app_state = AppState()
+
+
+def get_qdrant_client(retriever_config: RetrieverConfig) -> QdrantClient:
+    """
+    Return the process-wide Qdrant client, creating it on first use.
+
+    The client talks gRPC, which multiplexes every request from the app and
+    the Discord bot over one connection instead of opening new ones.
+    """
+    if app_state.qdrant_client is None:
+        app_state.qdrant_client = QdrantClient(
+            host=retriever_config.host,
+            port=retriever_config.port,
+            grpc_port=retriever_config.grpc_port,
+            prefer_grpc=True,
+            timeout=30,
+        )
+    return app_state.qdrant_client
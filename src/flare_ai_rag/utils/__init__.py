@@ -5,8 +5,10 @@ from .parser_utils import (
     parse_chat_response_as_json,
     parse_gemini_response_as_json,
 )
+from .semantic_cache import SemanticCache
 
 __all__ = [
+    "SemanticCache",
     "extract_author",
     "load_json",
     "load_txt",
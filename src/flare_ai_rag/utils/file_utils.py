@@ -1,3 +1,4 @@
+import functools
 import json
 from pathlib import Path
 
@@ -13,7 +14,18 @@ def load_txt(file_path: Path) -> str:
 
 
 def load_json(file_path: Path) -> dict:
-    """Read the selected model IDs from a JSON file."""
+    """
+    Read the selected model IDs from a JSON file.
+
+    The parsed result is cached until the file's modification time changes, so
+    callers share one dict and must not mutate it.
+    """
+    return _load_json_cached(file_path, file_path.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(file_path: Path, mtime_ns: int) -> dict:  # noqa: ARG001
+    """Parse a JSON file; mtime_ns is only part of the cache key."""
     with file_path.open() as f:
         return json.load(f)
 
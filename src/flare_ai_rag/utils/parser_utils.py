@@ -4,6 +4,8 @@ from typing import Any
 
 from flare_ai_rag.ai.base import ModelResponse
 
+_JSON_FENCE_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+
 
 def parse_chat_response(response: dict) -> str:
     """Parse response from chat completion endpoint"""
@@ -38,7 +40,6 @@ def parse_gemini_response_as_json(raw_response: ModelResponse) -> dict[str, Any]
         dict: The parsed JSON content.
     """
     text = raw_response.text
-    pattern = r"```json\s*(.*?)\s*```"
-    match = re.search(pattern, text, re.DOTALL)
+    match = _JSON_FENCE_RE.search(text)
     json_str = match.group(1) if match else text
     return json.loads(json_str)
@@ -0,0 +1,168 @@
+"""
+Semantic Cache Module
+
+This module implements an in-memory, LRU-bounded cache keyed by embedding
+similarity. Lookups use random-projection locality-sensitive hashing (LSH) to
+find candidate entries in O(1), then confirm a hit with an exact cosine check,
+so near-duplicate queries can reuse a previously computed answer.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class SemanticCache:
+    """
+    Approximate nearest-neighbour cache mapping embeddings to text values.
+
+    Each vector is hashed into `num_tables` buckets using `num_bits` random
+    hyperplanes per table. A lookup gathers every entry that shares at least one
+    bucket with the query and returns the most similar one if its cosine
+    similarity reaches `threshold`. The least recently used entry is evicted
+    once `max_entries` is exceeded, and entries older than `ttl` seconds are
+    never returned. All operations are guarded by a lock, so the cache can be
+    shared between threads.
+
+    Attributes:
+        threshold (float): Minimum cosine similarity for a cache hit
+        max_entries (int): Maximum number of cached entries
+        ttl (float | None): Seconds an entry stays valid, None for no expiry
+        hits (int): Number of successful lookups
+        misses (int): Number of failed lookups
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        dim: int,
+        num_tables: int = 8,
+        num_bits: int = 12,
+        threshold: float = 0.95,
+        max_entries: int = 10_000,
+        seed: int = 0,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Initialize the semantic cache.
+
+        Args:
+            dim (int): Dimension of the cached vectors
+            num_tables (int): Number of independent LSH hash tables
+            num_bits (int): Random projections (hash bits) per table
+            threshold (float): Minimum cosine similarity for a cache hit
+            max_entries (int): Maximum number of cached entries
+            seed (int): Seed for the random projections
+            ttl (float | None): Seconds an entry stays valid, None for no expiry
+        """
+        rng = np.random.default_rng(seed)
+        self._projections = rng.standard_normal(
+            (num_tables, dim, num_bits), dtype=np.float32
+        )
+        self._bit_weights = 1 << np.arange(num_bits, dtype=np.int64)
+        self._buckets: list[dict[int, set[int]]] = [{} for _ in range(num_tables)]
+        self._entries: OrderedDict[int, tuple[np.ndarray, np.ndarray, str, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, vector: Sequence[float] | np.ndarray) -> str | None:
+        """
+        Return the cached value for the most similar stored vector, if any.
+
+        Args:
+            vector: Query embedding
+
+        Returns:
+            str | None: The cached value on a hit, otherwise None.
+        """
+        unit = _normalize(vector)
+        codes = self._hash(unit)
+        with self._lock:
+            candidates: set[int] = set()
+            for table, code in zip(self._buckets, codes, strict=True):
+                candidates.update(table.get(int(code), ()))
+
+            now = time.monotonic()
+            best_id, best_score = None, self.threshold
+            for entry_id in candidates:
+                stored, _, _, expires_at = self._entries[entry_id]
+                if expires_at <= now:
+                    self._remove(entry_id)
+                    continue
+                score = float(stored @ unit)
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+
+            if best_id is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best_id)
+            value = self._entries[best_id][2]
+        logger.debug("semantic_cache_hit", score=best_score)
+        return value
+
+    def insert(self, vector: Sequence[float] | np.ndarray, value: str) -> None:
+        """
+        Cache a value under the given embedding, evicting the LRU entry if full.
+
+        Args:
+            vector: Embedding to index the value by
+            value: Value to return for similar future lookups
+        """
+        unit = _normalize(vector)
+        codes = self._hash(unit)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else math.inf
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (unit, codes, value, expires_at)
+            for table, code in zip(self._buckets, codes, strict=True):
+                table.setdefault(int(code), set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. once the data behind the cached values changed."""
+        with self._lock:
+            self._entries.clear()
+            for table in self._buckets:
+                table.clear()
+
+    def _remove(self, entry_id: int) -> None:
+        """Drop an entry from the entries and buckets. Callers hold the lock."""
+        _, codes, _, _ = self._entries.pop(entry_id)
+        for table, code in zip(self._buckets, codes, strict=True):
+            bucket = table[int(code)]
+            bucket.discard(entry_id)
+            if not bucket:
+                del table[int(code)]
+
+    def _hash(self, unit: np.ndarray) -> np.ndarray:
+        """Compute one integer bucket code per table from projection signs."""
+        bits = np.einsum("d,tdk->tk", unit, self._projections) > 0
+        return bits.astype(np.int64) @ self._bit_weights
+
+
+def _normalize(vector: Sequence[float] | np.ndarray) -> np.ndarray:
+    """Return the vector as a unit-length float32 array."""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm else array
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from flare_ai_rag.discord import service
+from flare_ai_rag.discord.service import DiscordMessageBatcher
+from flare_ai_rag.retriever.qdrant_collection import DiscordMessage
+
+
+def make_message(index: int) -> DiscordMessage:
+    return DiscordMessage(
+        content=f"message {index}",
+        author_id="author",
+        jump_url=f"https://discord.com/channels/1/2/{index}",
+    )
+
+
+def make_batcher(max_batch_size: int = 32) -> DiscordMessageBatcher:
+    return DiscordMessageBatcher(
+        qdrant_client=None,  # pyright: ignore[reportArgumentType]
+        retriever_config=None,  # pyright: ignore[reportArgumentType]
+        embedding_client=None,  # pyright: ignore[reportArgumentType]
+        max_batch_size=max_batch_size,
+        flush_seconds=0.05,
+    )
+
+
+def test_concurrent_messages_are_stored_together(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    batches: list[list[DiscordMessage]] = []
+
+    async def store(messages: list[DiscordMessage], **kwargs: Any) -> None:
+        batches.append(messages)
+
+    monkeypatch.setattr(service, "store_discord_messages", store)
+    messages = [make_message(index) for index in range(5)]
+
+    async def submit_all() -> None:
+        batcher = make_batcher(max_batch_size=3)
+        await asyncio.gather(*(batcher.submit(message) for message in messages))
+
+    asyncio.run(submit_all())
+
+    assert [len(batch) for batch in batches] == [3, 2]
+    assert [message for batch in batches for message in batch] == messages
+
+
+def test_store_errors_reach_every_submitter(monkeypatch: pytest.MonkeyPatch) -> None:
+    error = RuntimeError("qdrant unavailable")
+
+    async def store(messages: list[DiscordMessage], **kwargs: Any) -> None:
+        raise error
+
+    monkeypatch.setattr(service, "store_discord_messages", store)
+
+    async def submit_all() -> list[BaseException | None]:
+        batcher = make_batcher()
+        results = await asyncio.gather(
+            batcher.submit(make_message(0)),
+            batcher.submit(make_message(1)),
+            return_exceptions=True,
+        )
+        return list(results)
+
+    assert asyncio.run(submit_all()) == [error, error]
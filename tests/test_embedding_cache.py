@@ -0,0 +1,107 @@
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+from google.generativeai.embedding import EmbeddingTaskType
+
+from flare_ai_rag.ai import CachedGeminiEmbedding, GeminiEmbedding
+
+MODEL = "models/text-embedding-004"
+TASK = EmbeddingTaskType.RETRIEVAL_DOCUMENT
+MAX_ENTRIES = 2
+
+
+class FakeGemini:
+    """Stands in for the Gemini requests, recording every text sent."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[list[str], str | list[str] | None]] = []
+
+    def embed(self, contents: list[str], title: str | list[str] | None) -> np.ndarray:
+        self.requests.append((contents, title))
+        return np.array(
+            [[float(len(text)), float(sum(map(ord, text)))] for text in contents],
+            dtype=np.float32,
+        )
+
+
+@pytest.fixture
+def fake(monkeypatch: pytest.MonkeyPatch) -> FakeGemini:
+    fake = FakeGemini()
+
+    def embed_contents(
+        self: GeminiEmbedding,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: str | list[str] | None = None,
+    ) -> np.ndarray:
+        return fake.embed(contents, title)
+
+    async def aembed_contents(
+        self: GeminiEmbedding,
+        embedding_model: str,
+        contents: list[str],
+        task_type: EmbeddingTaskType,
+        title: str | list[str] | None = None,
+    ) -> np.ndarray:
+        return fake.embed(contents, title)
+
+    monkeypatch.setattr(GeminiEmbedding, "embed_contents", embed_contents)
+    monkeypatch.setattr(GeminiEmbedding, "aembed_contents", aembed_contents)
+    return fake
+
+
+def test_only_missing_texts_are_requested(fake: FakeGemini, tmp_path: Path) -> None:
+    client = CachedGeminiEmbedding("key", tmp_path / "cache.sqlite")
+    first = client.embed_contents(MODEL, ["a", "bb"], TASK)
+    second = client.embed_contents(MODEL, ["bb", "ccc", "a"], TASK)
+
+    assert fake.requests == [(["a", "bb"], None), (["ccc"], None)]
+    np.testing.assert_array_equal(second[[0, 2]], first[[1, 0]])
+    assert client.stats() == {"hits": 2, "misses": 3, "size": 3}
+
+
+def test_vectors_survive_reopening(fake: FakeGemini, tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    client = CachedGeminiEmbedding("key", path)
+    expected = client.embed_contents(MODEL, ["a", "bb"], TASK)
+    client.close()
+
+    reopened = CachedGeminiEmbedding("key", path)
+    np.testing.assert_array_equal(
+        reopened.embed_contents(MODEL, ["a", "bb"], TASK), expected
+    )
+    assert len(fake.requests) == 1
+
+
+def test_titles_are_part_of_the_key(fake: FakeGemini, tmp_path: Path) -> None:
+    client = CachedGeminiEmbedding("key", tmp_path / "cache.sqlite")
+    client.embed_contents(MODEL, ["a", "b"], TASK, title=["doc1", "doc2"])
+    client.embed_contents(MODEL, ["a", "b"], TASK, title=["doc1", "doc3"])
+
+    assert fake.requests[1] == (["b"], ["doc3"])
+
+
+def test_oldest_vectors_are_evicted(fake: FakeGemini, tmp_path: Path) -> None:
+    client = CachedGeminiEmbedding(
+        "key", tmp_path / "cache.sqlite", max_entries=MAX_ENTRIES
+    )
+    client.embed_contents(MODEL, ["a"], TASK)
+    client.embed_contents(MODEL, ["bb", "ccc"], TASK)
+    assert client.stats()["size"] == MAX_ENTRIES
+
+    client.embed_contents(MODEL, ["bb", "ccc", "a"], TASK)
+
+    assert fake.requests[-1] == (["a"], None)
+
+
+def test_async_embedding_shares_the_cache(fake: FakeGemini, tmp_path: Path) -> None:
+    client = CachedGeminiEmbedding("key", tmp_path / "cache.sqlite")
+    expected = client.embed_contents(MODEL, ["a"], TASK)
+
+    result = asyncio.run(client.aembed_contents(MODEL, ["a", "bb"], TASK))
+
+    np.testing.assert_array_equal(result[0], expected[0])
+    assert fake.requests[-1] == (["bb"], None)
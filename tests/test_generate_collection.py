@@ -1,11 +1,11 @@
 import pandas as pd
 import structlog
-from qdrant_client import QdrantClient
 
 from flare_ai_rag.ai import GeminiEmbedding
 from flare_ai_rag.retriever.config import RetrieverConfig
 from flare_ai_rag.retriever.qdrant_collection import generate_collection
 from flare_ai_rag.settings import settings
+from flare_ai_rag.state import get_qdrant_client
 from flare_ai_rag.utils import load_json
 
 logger = structlog.get_logger(__name__)
@@ -21,7 +21,7 @@ def main() -> None:
     logger.info("Loaded CSV Data.", num_rows=len(df_docs))
 
     # Initialize Qdrant client.
-    client = QdrantClient(host=retriever_config.host, port=retriever_config.port)
+    client = get_qdrant_client(retriever_config)
 
     # Initialize Gemini client
     embedding_client = GeminiEmbedding(api_key=settings.gemini_api_key)
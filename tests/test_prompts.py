@@ -0,0 +1,50 @@
+from string import Template
+
+import pytest
+
+from flare_ai_rag.prompts.library import PromptLibrary
+from flare_ai_rag.prompts.schemas import Prompt
+
+SHIPPED_PROMPTS = [
+    prompt for prompt in PromptLibrary().prompts.values() if prompt.required_inputs
+]
+
+EDGE_CASES = [
+    ("$a and $b", {"a": "Z"}),
+    ("$a and $b", {"a": "Z", "b": "Y"}),
+    ("$$ ${a} $b", {"a": "Z"}),
+    ("$$ ${a} $b", {}),
+    ("${a} {braces} $", {"a": "Z"}),
+    ("$a$a ${a}", {"a": "{Z}"}),
+    ("$1 $ a $a", {"a": "Z"}),
+    ("no placeholders {x}", {"a": "Z"}),
+]
+
+
+def make_prompt(template: str) -> Prompt:
+    return Prompt(
+        name="edge_case",
+        description="",
+        template=template,
+        required_inputs=["a"],
+        response_schema=None,
+        response_mime_type=None,
+    )
+
+
+@pytest.mark.parametrize("prompt", SHIPPED_PROMPTS, ids=lambda p: p.name)
+@pytest.mark.parametrize("given", ["all", "none"])
+def test_shipped_templates_match_safe_substitute(prompt: Prompt, given: str) -> None:
+    inputs = {name: "Z $b {x}" for name in prompt.required_inputs or []}
+    if given == "none":
+        inputs = {}
+    expected = Template(prompt.template).safe_substitute(inputs)
+    assert prompt.format(**inputs) == expected
+
+
+@pytest.mark.parametrize(("template", "inputs"), EDGE_CASES)
+def test_edge_cases_match_safe_substitute(
+    template: str, inputs: dict[str, str]
+) -> None:
+    expected = Template(template).safe_substitute(inputs)
+    assert make_prompt(template).format(**inputs) == expected
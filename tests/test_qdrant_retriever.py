@@ -1,9 +1,9 @@
 import structlog
-from qdrant_client import QdrantClient
 
 from flare_ai_rag.ai import GeminiEmbedding
 from flare_ai_rag.retriever import QdrantRetriever, RetrieverConfig
 from flare_ai_rag.settings import settings
+from flare_ai_rag.state import get_qdrant_client
 from flare_ai_rag.utils import load_json
 
 logger = structlog.get_logger(__name__)
@@ -15,7 +15,7 @@ def main() -> None:
     retriever_config = RetrieverConfig.load(config_json["retriever_config"])
 
     # Initialize Qdrant client
-    client = QdrantClient(host=retriever_config.host, port=retriever_config.port)
+    client = get_qdrant_client(retriever_config)
 
     # Initialize Gemini client
     embedding_client = GeminiEmbedding(api_key=settings.gemini_api_key)
@@ -1,6 +1,6 @@
 import structlog
 
-from flare_ai_rag.ai import GeminiProvider, OpenRouterClient
+from flare_ai_rag.ai import get_gemini_provider, get_openrouter_client
 from flare_ai_rag.responder import GeminiResponder, OpenRouterResponder, ResponderConfig
 from flare_ai_rag.settings import settings
 
@@ -12,7 +12,7 @@ def test_gemini_responder(query: str, retrieved_docs: list[dict]) -> None:
     responder_config = ResponderConfig.load({"id": "gemini-1.5-flash"})
 
     # Set up a new Gemini Provider based on Responder Config.
-    gemini_provider = GeminiProvider(
+    gemini_provider = get_gemini_provider(
         api_key=settings.gemini_api_key,
         model=responder_config.model.model_id,
         system_instruction=responder_config.system_prompt,
@@ -30,7 +30,7 @@ def test_gemini_responder(query: str, retrieved_docs: list[dict]) -> None:
 
 def test_openrouter_responder(query: str, retrieved_docs: list[dict]) -> None:
     # Initialize OpenRouter client
-    client = OpenRouterClient(
+    client = get_openrouter_client(
         api_key=settings.open_router_api_key, base_url=settings.open_router_base_url
     )
 
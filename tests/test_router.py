@@ -1,17 +1,38 @@
+import asyncio
+import sys
+
 import structlog
 
-from flare_ai_rag.ai import GeminiProvider, OpenRouterClient
+from flare_ai_rag.ai import get_gemini_provider, get_openrouter_client
 from flare_ai_rag.router import GeminiRouter, QueryRouter, RouterConfig
 from flare_ai_rag.settings import settings
 
 logger = structlog.get_logger(__name__)
 
+GEMINI_ROUTER_CONFIG = RouterConfig.load({"id": "gemini-1.5-flash"})
+
+QUERIES: tuple[str, ...] = tuple(
+    sys.intern(query)
+    for query in (
+        "What is the capital of France?",
+        "Is Flare an EVM chain?",
+        "What is the FTSO?",
+    )
+)
+
+
+def log_classifications(queries: tuple[str, ...], classifications: list[str]) -> None:
+    for query, classification in zip(queries, classifications, strict=True):
+        logger.info("Query processed.", query=query, classification=classification)
 
-def test_open_router(queries: list[str]) -> None:
+
+async def test_open_router(queries: tuple[str, ...]) -> None:
     # Initialize OpenRouter client
-    client = OpenRouterClient(
+    client = get_openrouter_client(
         api_key=settings.open_router_api_key, base_url=settings.open_router_base_url
     )
+    # Pay the TLS handshake before the first query.
+    await asyncio.to_thread(client.warm_up)
 
     # Set up router config
     model_config = {"id": "qwen/qwen-vl-plus:free", "max_tokens": 50, "temperature": 0}
@@ -20,41 +41,39 @@ def test_open_router(queries: list[str]) -> None:
     # Initialize the QueryRouter.
     router = QueryRouter(client=client, config=router_config)
 
-    # Process each query and print its classification.
-    for query in queries:
-        classification = router.route_query(query)
-        logger.info("Query processed.", classification=classification)
+    # Classify all queries in one request and print their classifications.
+    log_classifications(queries, await router.aroute_queries(list(queries)))
 
 
-def test_gemini_router(queries: list[str]) -> None:
-    router_config = RouterConfig.load({"id": "gemini-1.5-flash"})
+async def test_gemini_router(queries: tuple[str, ...]) -> None:
+    router_config = GEMINI_ROUTER_CONFIG
 
     # Initialize Gemini client
-    client = GeminiProvider(
+    client = get_gemini_provider(
         api_key=settings.gemini_api_key,
         model=router_config.model.model_id,
         system_instruction=router_config.system_prompt,
     )
+    # Pay the TLS handshake before the first query.
+    await client.awarm_up()
     logger.info("Initialized Gemini Provider.")
     # Initialize the GeminiRouter
     router = GeminiRouter(client=client, config=router_config)
 
-    # Process each query and print its classification.
-    for query in queries:
-        classification = router.route_query(query)
-        logger.info("Query processed.", classification=classification)
+    # Classify all queries in one request and print their classifications.
+    log_classifications(queries, await router.aroute_queries(list(queries)))
 
 
-def main() -> None:
-    queries = [
-        "What is the capital of France?",
-        "Is Flare an EVM chain?",
-        "What is the FTSO?",
-    ]
+async def run_tests(queries: tuple[str, ...]) -> None:
+    # The providers share no state or rate limit, so run them side by side.
+    await asyncio.gather(
+        test_gemini_router(queries),
+        # For OpenRouter: test_open_router(queries),
+    )
 
-    test_gemini_router(queries)
 
-    # For OpenRouter: test_open_router(queries)
+def main() -> None:
+    asyncio.run(run_tests(QUERIES))
 
 
 if __name__ == "__main__":
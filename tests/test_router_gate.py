@@ -0,0 +1,67 @@
+"""
+Calibration check for the embedding router gate.
+
+Embeds labelled example queries with the production embedding model and checks
+that every query the gate classifies gets its expected label, i.e. that the
+configured thresholds only let through matches the query router would agree
+with. Needs GEMINI_API_KEY; skipped otherwise.
+"""
+
+import pytest
+import structlog
+
+from flare_ai_rag.ai import EmbeddingTaskType, GeminiEmbedding
+from flare_ai_rag.retriever import RetrieverConfig
+from flare_ai_rag.router import ROUTER_LABEL_DESCRIPTIONS, EmbeddingRouterGate
+from flare_ai_rag.settings import settings
+from flare_ai_rag.utils import load_json
+
+logger = structlog.get_logger(__name__)
+
+LABELLED_QUERIES: tuple[tuple[str, str], ...] = (
+    ("What is the FTSO?", "ANSWER"),
+    ("How do I delegate FLR to an FTSO data provider?", "ANSWER"),
+    ("What does the Flare Data Connector attest to?", "ANSWER"),
+    ("How are FTSO v2 block-latency feeds different from anchor feeds?", "ANSWER"),
+    ("Is Flare an EVM chain?", "ANSWER"),
+    ("How do I stake on Flare?", "ANSWER"),
+    ("it doesn't work", "CLARIFY"),
+    ("what about the other one?", "CLARIFY"),
+    ("can you explain that again", "CLARIFY"),
+    ("help", "CLARIFY"),
+    ("What is the capital of France?", "REJECT"),
+    ("Give me a recipe for lasagna.", "REJECT"),
+    ("Who won the last football world cup?", "REJECT"),
+    ("How do I pick a lock?", "REJECT"),
+    ("Write a poem about the ocean.", "REJECT"),
+)
+
+
+@pytest.mark.skipif(not settings.gemini_api_key, reason="GEMINI_API_KEY not set")
+def test_gate_only_returns_expected_labels() -> None:
+    input_config = load_json(settings.input_path / "input_parameters.json")
+    retriever_config = RetrieverConfig.load(input_config["retriever_config"])
+    embedding_client = GeminiEmbedding(api_key=settings.gemini_api_key)
+
+    gate = EmbeddingRouterGate.from_descriptions(
+        embedding_client,
+        retriever_config.embedding_model,
+        ROUTER_LABEL_DESCRIPTIONS,
+        min_similarity=settings.router_gate_min_similarity,
+        min_margin=settings.router_gate_min_margin,
+    )
+    query_vectors = embedding_client.embed_contents(
+        embedding_model=retriever_config.embedding_model,
+        contents=[query for query, _ in LABELLED_QUERIES],
+        task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
+    )
+
+    wrong = []
+    for (query, expected), vector in zip(LABELLED_QUERIES, query_vectors, strict=True):
+        label = gate.classify(vector)
+        logger.info("Gate decision.", query=query, expected=expected, label=label)
+        if label is not None and label != expected:
+            wrong.append((query, expected, label))
+
+    logger.info("Gate coverage.", hits=gate.hits, total=len(LABELLED_QUERIES))
+    assert not wrong, f"Gate overrode the router with wrong labels: {wrong}"
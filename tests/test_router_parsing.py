@@ -0,0 +1,53 @@
+# pyright: reportPrivateUsage=false
+import json
+
+import pytest
+
+from flare_ai_rag.router import RouterConfig
+from flare_ai_rag.router.router import _ClassificationMemo, _parse_batch
+
+CONFIG = RouterConfig.load({"id": "gemini-1.5-flash"})
+
+
+def parse_json(text: str) -> object:
+    return json.loads(text)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"classifications": ["ANSWER", "reject"]}', ["ANSWER", "REJECT"]),
+        ('{"classifications": ["ANSWER", "maybe"]}', ["ANSWER", "CLARIFY"]),
+        ('{"classifications": ["ANSWER", 3]}', ["ANSWER", "CLARIFY"]),
+        ('{"classifications": ["ANSWER"]}', None),
+        ('{"classifications": "ANSWER"}', None),
+        ('["ANSWER", "REJECT"]', None),
+        ("not json", None),
+    ],
+)
+def test_parse_batch(text: str, expected: list[str] | None) -> None:
+    assert _parse_batch(CONFIG, lambda: parse_json(text), 2) == expected
+
+
+def test_memo_key_covers_the_request() -> None:
+    key = _ClassificationMemo.key(CONFIG, "prompt", None, None)
+
+    assert key == _ClassificationMemo.key(CONFIG, "prompt", None, None)
+    assert key != _ClassificationMemo.key(CONFIG, "other", None, None)
+    assert key != _ClassificationMemo.key(CONFIG, "prompt", "application/json", None)
+    other_model = RouterConfig.load({"id": "gemini-2.0-flash"})
+    assert key != _ClassificationMemo.key(other_model, "prompt", None, None)
+
+
+def test_memo_evicts_least_recently_used() -> None:
+    memo = _ClassificationMemo(maxsize=2)
+    keys = [_ClassificationMemo.key(CONFIG, f"q{i}", None, None) for i in range(3)]
+    memo.put(keys[0], "ANSWER")
+    memo.put(keys[1], "REJECT")
+    assert memo.get(keys[0]) == "ANSWER"
+
+    memo.put(keys[2], "CLARIFY")
+
+    assert memo.get(keys[0]) == "ANSWER"
+    assert memo.get(keys[1]) is None
+    assert memo.get(keys[2]) == "CLARIFY"
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from flare_ai_rag.utils import SemanticCache
+from flare_ai_rag.utils import semantic_cache as semantic_cache_module
+
+DIM = 64
+MAX_ENTRIES = 2
+
+
+def unit_vector(index: int) -> np.ndarray:
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[index] = 1.0
+    return vector
+
+
+def test_lookup_hits_same_and_near_duplicate_vectors() -> None:
+    cache = SemanticCache(dim=DIM)
+    vector = np.random.default_rng(1).standard_normal(DIM)
+    cache.insert(vector, "answer")
+
+    queries = [vector, vector * 3, vector + 0.01]
+    for query in queries:
+        assert cache.lookup(query) == "answer"
+    assert cache.hits == len(queries)
+
+
+def test_lookup_misses_dissimilar_vectors() -> None:
+    cache = SemanticCache(dim=DIM)
+    cache.insert(unit_vector(0), "answer")
+
+    queries = [unit_vector(1), -unit_vector(0)]
+    for query in queries:
+        assert cache.lookup(query) is None
+    assert cache.misses == len(queries)
+
+
+def test_lookup_returns_most_similar_entry() -> None:
+    cache = SemanticCache(dim=DIM, threshold=0.5)
+    base = unit_vector(0)
+    cache.insert(base + 0.6 * unit_vector(1), "far")
+    cache.insert(base + 0.1 * unit_vector(1), "near")
+
+    assert cache.lookup(base) == "near"
+
+
+def test_expired_entries_are_not_returned(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(semantic_cache_module.time, "monotonic", lambda: now)
+    cache = SemanticCache(dim=DIM, ttl=10.0)
+    cache.insert(unit_vector(0), "answer")
+
+    now = 1009.0
+    assert cache.lookup(unit_vector(0)) == "answer"
+    now = 1010.0
+    assert cache.lookup(unit_vector(0)) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = SemanticCache(dim=DIM, max_entries=MAX_ENTRIES)
+    cache.insert(unit_vector(0), "first")
+    cache.insert(unit_vector(1), "second")
+    assert cache.lookup(unit_vector(0)) == "first"
+
+    cache.insert(unit_vector(2), "third")
+
+    assert len(cache) == MAX_ENTRIES
+    assert cache.lookup(unit_vector(0)) == "first"
+    assert cache.lookup(unit_vector(1)) is None
+    assert cache.lookup(unit_vector(2)) == "third"
+
+
+def test_clear_drops_every_entry() -> None:
+    cache = SemanticCache(dim=DIM)
+    cache.insert(unit_vector(0), "first")
+    cache.insert(unit_vector(1), "second")
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.lookup(unit_vector(0)) is None
+    cache.insert(unit_vector(0), "again")
+    assert cache.lookup(unit_vector(0)) == "again"